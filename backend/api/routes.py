@@ -1,9 +1,18 @@
-from fastapi import FastAPI
+import os
+import time
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from backend.solver import solve_scenario
-from pydantic import BaseModel
+from backend.solver import solve_scenario, solve_batch, match_team_name
+from backend.magic_numbers import load_magic_numbers
+from backend.monte_carlo import run_trajectory
+from backend.data_loader import load_snapshot, load_cached_odds, USE_DUMMY_DATA, UNPLAYED_STATUSES
+from backend.metrics import timed, observe, start_request_timing, server_timing_header, render_metrics, sample_profile
+from backend.prewarm import prewarm_lifespan, prewarmed, prewarm_timings
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Union
 
-app = FastAPI()
+app = FastAPI(lifespan=prewarm_lifespan)
 
 # Enable CORS for Vercel deployments and local development
 app.add_middleware(
@@ -18,10 +27,101 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# per-request profiling is opt-in: set ENABLE_PROFILING=1 and call with ?profile=true
+PROFILING_ENABLED = os.getenv("ENABLE_PROFILING") == "1"
+
+# flips after the first request so its latency is reported separately from warm requests
+first_request_pending = True
+
+@app.middleware("http")
+async def add_server_timing(request: Request, call_next):
+    global first_request_pending
+    timings = start_request_timing()
+    start = time.perf_counter()
+    response = await call_next(request)
+    total = time.perf_counter() - start
+    response.headers["Server-Timing"] = server_timing_header(timings, total)
+    if first_request_pending:
+        first_request_pending = False
+        observe("first_request", total, route=request.url.path, prewarmed=prewarmed.is_set())
+    return response
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok", "prewarmed": prewarmed.is_set(), "prewarm_seconds": prewarm_timings}
+
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 class ScenarioRequest(BaseModel):
     user_prompt: str
 
 @app.post("/simulate/")
-def simulate_league(request: ScenarioRequest):
-    result = solve_scenario(request.user_prompt)
-    return result
\ No newline at end of file
+def simulate_league(request: ScenarioRequest, profile: bool = False):
+    # profiled requests are timed too, so they still show up in the request histogram
+    with timed("request", route="/simulate/"):
+        if profile and PROFILING_ENABLED:
+            with sample_profile() as samples:
+                result = solve_scenario(request.user_prompt)
+            result["profile"] = samples
+        else:
+            result = solve_scenario(request.user_prompt)
+    return result
+
+
+class BatchRequest(BaseModel):
+    # natural-language prompts or {"target_team", "target_rank", "fixed_outcomes"} dicts
+    scenarios: List[Union[str, dict]]
+    explain: bool = True
+
+@app.post("/simulate/batch/")
+def simulate_batch(request: BatchRequest):
+    return {"results": solve_batch(request.scenarios, explain=request.explain)}
+
+
+class TrajectoryRequest(BaseModel):
+    target_team: str
+    target_rank: int = Field(ge=1)  # upper bound is the league's team count, checked in the route
+    fixed_outcomes: Dict[str, Literal["home", "draw", "away"]] = {}  # e.g. {"Arsenal FC vs Chelsea FC": "home"}
+
+@app.post("/trajectory/")
+def trajectory(request: TrajectoryRequest):
+    standings_df, fixtures_df, version = load_snapshot(dummy=USE_DUMMY_DATA)
+    try:
+        target_team = match_team_name(request.target_team, standings_df["team_name"].tolist())
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    if request.target_rank > len(standings_df):
+        raise HTTPException(status_code=422, detail=f"target_rank must be between 1 and {len(standings_df)}.")
+
+    # fixed outcomes must name a remaining fixture exactly, otherwise they'd be silently ignored
+    unplayed = fixtures_df[fixtures_df["status"].isin(UNPLAYED_STATUSES)]
+    match_keys = set(unplayed["home_team_name"] + " vs " + unplayed["away_team_name"])
+    unknown = [match for match in request.fixed_outcomes if match not in match_keys]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"No remaining fixture matches {', '.join(unknown)}. "
+                                                    "Use 'Home Team vs Away Team' with the full team names.")
+
+    return {
+        "target_team": target_team,
+        "target_rank": request.target_rank,
+        "trajectory": run_trajectory(target_team, request.target_rank, request.fixed_outcomes, standings_df, fixtures_df,
+                                     odds_data=load_cached_odds())
+    }
+
+
+@app.get("/magic-numbers/")
+def magic_numbers(team: str = None):
+    table = load_magic_numbers(dummy=USE_DUMMY_DATA)
+    if team is None:
+        return table
+    try:
+        team_name = match_team_name(team, list(table["teams"]))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"version": table["version"], "team": team_name, **table["teams"][team_name]}
@@ -1,37 +1,289 @@
 import json
 import os
+import hashlib
+import numpy as np
+from backend.metrics import timed, record_cache
+from backend.league_config import get_league_config, DEFAULT_LEAGUE
+
+# the bundled dummy data is the default; set DUMMY_DATA=0 to serve what backend.refresh fetched
+USE_DUMMY_DATA = os.getenv("DUMMY_DATA", "1") != "0"
+
+# parsed files kept in-process between requests, dropped when a file's mtime changes
+_snapshot_cache = {}  # (standings_file, fixtures_file) -> (mtimes, (standings_df, fixtures_df, version))
+_odds_cache = {}  # odds_file -> (mtime, odds)
+
+# football-data statuses of fixtures still to be played (TIMED is SCHEDULED with a confirmed kick-off)
+UNPLAYED_STATUSES = ("SCHEDULED", "TIMED", "IN_PLAY", "PAUSED", "POSTPONED", "SUSPENDED")
+
+SNAPSHOT_FORMAT = 1  # bump when the binary snapshot layout changes
+# integer standings columns, in build_frames() order after team_id and team_name
+STANDINGS_COLUMNS = ["points", "played", "won", "drawn", "lost", "goal_difference", "goals_for", "goals_against", "position"]
 
 # helper function to load JSON file
 def load_json(file_path):
     with open(file_path, "r") as f:
         return json.load(f)
 
-def load_data(dummy=True):
+# helper function to save JSON file, via a temp file so readers never see a partial write
+def save_json(data, file_path):
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, file_path)
+
+def get_data_dir():
+    # absolute path to data directory
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, "data")
+
+
+def get_data_files(league=DEFAULT_LEAGUE, dummy=True):
+    """
+    Returns the (standings, fixtures) file paths for a league, e.g. data/prem_standings.json.
+    """
+    prefix = get_league_config(league)["data_prefix"]
+    if dummy:
+        prefix = f"dummy_{prefix}"
+    data_dir = get_data_dir()
+    return os.path.join(data_dir, f"{prefix}_standings.json"), os.path.join(data_dir, f"{prefix}_fixtures.json")
+
+
+def get_snapshot_file(league=DEFAULT_LEAGUE, dummy=True):
+    """
+    Returns the binary snapshot path for a league, e.g. data/prem_snapshot.npz.
+    """
+    prefix = get_league_config(league)["data_prefix"]
+    if dummy:
+        prefix = f"dummy_{prefix}"
+    return os.path.join(get_data_dir(), f"{prefix}_snapshot.npz")
+
+
+def get_odds_file(league=DEFAULT_LEAGUE):
+    """
+    Returns the path get_odds() caches a league's odds to, e.g. data/cached_odds.json.
+    """
+    return os.path.join(get_data_dir(), get_league_config(league)["odds_file"])
+
+
+def load_data(dummy=USE_DUMMY_DATA, league=DEFAULT_LEAGUE):
     """
     Loads data from the data directory.
     If dummy is True, loads dummy data, otherwise loads real data.
     Returns standings and fixtures data.
     """
-    # absolute path to data directory
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    data_dir = os.path.join(base_dir, "data")
-
+    standings_file, fixtures_file = get_data_files(league, dummy)
     if dummy:
-        standings_file = os.path.join(data_dir, "dummy_prem_standings.json")
-        fixtures_file = os.path.join(data_dir, "dummy_prem_fixtures.json")
         print("Loaded dummy data")
     else:
-        standings_file = os.path.join(data_dir, "prem_standings.json")
-        fixtures_file = os.path.join(data_dir, "prem_fixtures.json")
         print("Loaded real data")
     
     # load JSON files
-    standings = load_json(standings_file)
-    fixtures = load_json(fixtures_file)
+    with timed("load_data"):
+        standings = load_json(standings_file)
+        fixtures = load_json(fixtures_file)
 
     return standings, fixtures
 
 
-    
+def snapshot_version(standings, fixtures):
+    """
+    Hashes the raw standings and fixtures JSON so derived data can be tied to a snapshot.
+    """
+    key_string = json.dumps({"standings": standings, "fixtures": fixtures}, sort_keys=True)
+    return hashlib.md5(key_string.encode()).hexdigest()
+
+
+def load_snapshot(dummy=USE_DUMMY_DATA, league=DEFAULT_LEAGUE):
+    """
+    Loads standings and fixtures as dataframes, plus the snapshot version hash.
+    Reads the binary snapshot written by write_binary_snapshot() when it is newer
+    than the JSON files, otherwise parses the JSON. The result is reused until a
+    file changes on disk, so only the first request (or the boot-time prewarm) pays for loading.
+    Returns standings_df, fixtures_df, version.
+    """
+    files = get_data_files(league, dummy)
+    for path in files:
+        if not os.path.exists(path):
+            hint = "set DUMMY_DATA=0 to use fetched data" if dummy else "run python -m backend.refresh to fetch it"
+            raise FileNotFoundError(f"No {'dummy' if dummy else 'real'} data at {path}, {hint}.")
+    mtimes = tuple(os.path.getmtime(path) for path in files)
+    snapshot_file = get_snapshot_file(league, dummy)
+    binary = os.path.exists(snapshot_file) and os.path.getmtime(snapshot_file) >= max(mtimes)
+    if binary:
+        mtimes += (os.path.getmtime(snapshot_file),)
+
+    cached = _snapshot_cache.get(files)
+    hit = cached is not None and cached[0] == mtimes
+    record_cache("snapshot", hit)
+
+    if hit:
+        standings_df, fixtures_df, version = cached[1]
+    elif binary:
+        with timed("load_data", format="npz"):
+            standings_df, fixtures_df, version = load_binary_snapshot(snapshot_file)
+        _snapshot_cache[files] = (mtimes, (standings_df, fixtures_df, version))
+    else:
+        standings_json, fixtures_json = load_data(dummy=dummy, league=league)
+        standings_df, fixtures_df = build_frames(standings_json, fixtures_json)
+        version = snapshot_version(standings_json, fixtures_json)
+        _snapshot_cache[files] = (mtimes, (standings_df, fixtures_df, version))
+
+    config = get_league_config(league)
+    if len(standings_df) != config["num_teams"]:
+        raise ValueError(f"{config['name']} should have {config['num_teams']} teams, standings have {len(standings_df)}.")
+    return standings_df, fixtures_df, version
+
+
+def build_frames(standings_json, fixtures_json):
+    """
+    Converts the raw football-data JSON into standings and fixtures dataframes.
+    """
+    # pandas is imported on first use to keep worker boot fast
+    import pandas as pd
+
+    # extract team info
+    table = standings_json["standings"][0]["table"]
+
+    # create list for standings
+    standings_list = []
+    for entry in table:
+        standings_list.append({
+            "team_id": entry["team"]["id"],
+            "team_name": entry["team"]["name"],
+            "points": entry["points"],
+            "played": entry["playedGames"],
+            "won": entry["won"],
+            "drawn": entry["draw"],
+            "lost": entry["lost"],
+            "goal_difference": entry["goalDifference"],
+            "goals_for": entry["goalsFor"],
+            "goals_against": entry["goalsAgainst"],
+            "position": entry["position"]
+        })
+
+    # convert list to dataframe
+    standings_df = pd.DataFrame(standings_list)
+
+    # extract fixture info
+    fixtures = fixtures_json["matches"]
+
+    # create list for fixtures
+    fixtures_list = []
+    for fixture in fixtures:
+        fixtures_list.append({
+            "match_id": fixture["id"],
+            "matchday": fixture["matchday"],
+            "home_team_id": fixture["homeTeam"]["id"],
+            "home_team_name": fixture["homeTeam"]["name"],
+            "away_team_id": fixture["awayTeam"]["id"],
+            "away_team_name": fixture["awayTeam"]["name"],
+            "utc_date": fixture["utcDate"],
+            "status": fixture["status"]
+        })
+
+    # convert list to dataframe
+    fixtures_df = pd.DataFrame(fixtures_list)
+
+    return standings_df, fixtures_df
+
+
+def write_binary_snapshot(standings_json, fixtures_json, file_path):
+    """
+    Writes a snapshot as integer-indexed numpy arrays (.npz) plus its version hash, so
+    load_snapshot() can skip JSON parsing. Fixtures reference teams by their row in the
+    team arrays. The version matches snapshot_version() of the same JSON, so caches
+    keyed by version stay valid whichever format was loaded.
+
+    Args:
+        standings_json (dict): Raw football-data standings.
+        fixtures_json (dict): Raw football-data matches.
+        file_path (str): Destination, see get_snapshot_file().
+
+    Returns:
+        str: Snapshot version.
+    """
+    standings_df, fixtures_df = build_frames(standings_json, fixtures_json)
+    team_index = {team_id: i for i, team_id in enumerate(standings_df["team_id"])}
+    unknown = set(fixtures_df["home_team_id"]).union(fixtures_df["away_team_id"]) - set(team_index)
+    if unknown:
+        raise ValueError(f"Fixtures reference teams missing from the standings: {sorted(unknown)}")
+
+    version = snapshot_version(standings_json, fixtures_json)
+    arrays = {
+        "format": np.array(SNAPSHOT_FORMAT),
+        "version": np.array(version),
+        "team_id": standings_df["team_id"].to_numpy(np.int64),
+        "team_name": np.array(standings_df["team_name"].tolist()),
+        "match_id": fixtures_df["match_id"].to_numpy(np.int64),
+        "matchday": fixtures_df["matchday"].to_numpy(np.int16),
+        "home_idx": fixtures_df["home_team_id"].map(team_index).to_numpy(np.int16),
+        "away_idx": fixtures_df["away_team_id"].map(team_index).to_numpy(np.int16),
+        "utc_date": np.array(fixtures_df["utc_date"].tolist()),
+        "status": np.array(fixtures_df["status"].tolist())
+    }
+    for column in STANDINGS_COLUMNS:
+        arrays[column] = standings_df[column].to_numpy(np.int16)
+
+    # write to a temp file first so a concurrent load never reads a partial snapshot
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, file_path)
+    return version
+
+
+def load_binary_snapshot(file_path):
+    """
+    Rebuilds the build_frames() dataframes from a snapshot written by write_binary_snapshot().
+    Returns standings_df, fixtures_df, version.
+    """
+    import pandas as pd
+
+    with np.load(file_path, allow_pickle=False) as arrays:
+        if int(arrays["format"]) != SNAPSHOT_FORMAT:
+            raise ValueError(f"{file_path} has snapshot format {int(arrays['format'])}, expected {SNAPSHOT_FORMAT}.")
+
+        team_ids = arrays["team_id"]
+        team_names = arrays["team_name"].astype(object)
+        standings_df = pd.DataFrame({
+            "team_id": team_ids,
+            "team_name": team_names,
+            **{column: arrays[column].astype(np.int64) for column in STANDINGS_COLUMNS}
+        })
+
+        home_idx, away_idx = arrays["home_idx"], arrays["away_idx"]
+        fixtures_df = pd.DataFrame({
+            "match_id": arrays["match_id"],
+            "matchday": arrays["matchday"].astype(np.int64),
+            "home_team_id": team_ids[home_idx],
+            "home_team_name": team_names[home_idx],
+            "away_team_id": team_ids[away_idx],
+            "away_team_name": team_names[away_idx],
+            "utc_date": arrays["utc_date"].astype(object),
+            "status": arrays["status"].astype(object)
+        })
+        version = str(arrays["version"])
+
+    return standings_df, fixtures_df, version
+
+
+def load_cached_odds(league=DEFAULT_LEAGUE):
+    """
+    Loads the odds last saved by get_odds() from the league's odds file (data/cached_odds.json for the PL).
+    Parsed odds are reused until get_odds() rewrites the file.
+    Returns an empty dict if no odds have been cached yet.
+    """
+    odds_file = get_odds_file(league)
+
+    if not os.path.exists(odds_file):
+        return {}
 
+    mtime = os.path.getmtime(odds_file)
+    cached = _odds_cache.get(odds_file)
+    hit = cached is not None and cached[0] == mtime
+    record_cache("odds", hit)
+    if not hit:
+        cached = (mtime, load_json(odds_file))
+        _odds_cache[odds_file] = cached
+    return cached[1]
 
@@ -1,22 +1,34 @@
-import requests
 import os
 from dotenv import load_dotenv
-import json
+from backend.league_config import get_league_config, DEFAULT_LEAGUE
+from backend.data_loader import get_data_files, save_json
+from backend.http_client import get_session, REQUEST_TIMEOUT
 
 load_dotenv()
 
 FOOTBALL_DATA_API_KEY = os.getenv("FOOTBALL_DATA_API_KEY")
-BASE_URL = "https://api.football-data.org/v4/competitions/PL" # access premier league data
+# overridable so a refresh can run against a local stand-in server
+API_URL = os.getenv("FOOTBALL_DATA_URL", "https://api.football-data.org/v4/competitions")
+
+def get_base_url(league=DEFAULT_LEAGUE):
+    # e.g. .../competitions/PL for premier league data
+    return f"{API_URL}/{get_league_config(league)['football_data_code']}"
+
+def get_standings_url(league=DEFAULT_LEAGUE):
+    return f"{get_base_url(league)}/standings" # API endpoint for standings
+
+def get_fixtures_url(league=DEFAULT_LEAGUE):
+    return f"{get_base_url(league)}/matches?status=SCHEDULED" # API endpoint for fixtures
 
 headers = {
     "X-Auth-Token": FOOTBALL_DATA_API_KEY # required API key for football data
 }
 
 # function to fetch standings data
-def get_standings():
-    url = f"{BASE_URL}/standings" # API endpoint for standings
+def get_standings(league=DEFAULT_LEAGUE):
+    url = get_standings_url(league)
 
-    response = requests.get(url, headers=headers) # GET request to API
+    response = get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT) # GET request to API
 
     if response.status_code != 200: # check errors
         print(f"Error fetching standings: {response.status_code}")
@@ -24,16 +36,16 @@ def get_standings():
 
     data = response.json() # parse response
 
-    with open("data/prem_standings.json", "w") as f:
-        json.dump(data, f, indent=4)
+    standings_file, _ = get_data_files(league, dummy=False)
+    save_json(data, standings_file)
 
-    print("Premier League standings saved to data/prem_standings.json")
+    print(f"{get_league_config(league)['name']} standings saved to {standings_file}")
 
 
-def get_fixtures():
-    url = f"{BASE_URL}/matches?status=SCHEDULED" # API endpoint for fixtures
+def get_fixtures(league=DEFAULT_LEAGUE):
+    url = get_fixtures_url(league)
 
-    response = requests.get(url, headers=headers) # GET request to API
+    response = get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT) # GET request to API
 
     if response.status_code != 200: # check errors
         print(f"Error fetching fixtures: {response.status_code}")
@@ -41,10 +53,10 @@ def get_fixtures():
     
     data = response.json() # parse response
     
-    with open("data/prem_fixtures.json", "w") as f:
-        json.dump(data, f, indent=4)
+    _, fixtures_file = get_data_files(league, dummy=False)
+    save_json(data, fixtures_file)
 
-    print("Premier League fixtures saved to data/prem_fixtures.json")
+    print(f"{get_league_config(league)['name']} fixtures saved to {fixtures_file}")
 
 
 
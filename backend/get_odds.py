@@ -1,27 +1,54 @@
 import os
-import requests
-import json
 from dotenv import load_dotenv
+from backend.metrics import timed
+from backend.league_config import get_league_config, DEFAULT_LEAGUE
+from backend.data_loader import get_data_dir, get_odds_file, save_json
+from backend.http_client import get_session, REQUEST_TIMEOUT
 
 # Load API keys from the .env file
 load_dotenv()
 API_KEY = os.getenv("ODDS_API_KEY")
+# overridable so a refresh can run against a local stand-in server
+ODDS_API_URL = os.getenv("ODDS_API_URL", "https://api.the-odds-api.com/v4/sports")
 
-def get_odds(save_to_file=True):
+def get_odds(save_to_file=True, league=DEFAULT_LEAGUE):
     """
-    Fetches current Premier League match odds from OddsAPI and converts them to normalized probabilities.
+    Fetches current match odds for a league from OddsAPI and converts them to normalized probabilities.
 
     Args:
-        save_to_file (bool): If True, saves the odds to data/cached_odds.json.
+        save_to_file (bool): If True, saves the odds to the league's odds file (data/cached_odds.json for the PL).
+        league (str or dict): League code or config, see backend.league_config.
 
     Returns:
         dict: A dictionary of match odds and probabilities.
     """
-    SPORT = 'soccer_epl'   # Premier League
+    url, params = get_odds_request(league)
+
+    with timed("get_odds"):
+        response = get_session().get(url, params=params, timeout=REQUEST_TIMEOUT)
+
+    if response.status_code != 200:
+        raise Exception(f"API error: {response.status_code}, {response.text}")
+
+    odds_data = parse_odds(response.json())
+
+    # Save to local JSON
+    if save_to_file:
+        os.makedirs(get_data_dir(), exist_ok=True)
+        save_json(odds_data, get_odds_file(league))
+
+    return odds_data
+
+
+def get_odds_request(league=DEFAULT_LEAGUE):
+    """
+    Returns the OddsAPI (url, params) for a league's head-to-head odds.
+    """
+    SPORT = get_league_config(league)['odds_sport_key']   # e.g. soccer_epl for the Premier League
     REGION = 'uk'          # Use UK bookmakers
     MARKET = 'h2h'         # Head-to-head (Win/Draw/Loss)
 
-    url = f'https://api.the-odds-api.com/v4/sports/{SPORT}/odds'
+    url = f'{ODDS_API_URL}/{SPORT}/odds'
 
     params = {
         'apiKey': API_KEY,
@@ -29,13 +56,19 @@ def get_odds(save_to_file=True):
         'markets': MARKET,
         'oddsFormat': 'decimal',
     }
+    return url, params
 
-    response = requests.get(url, params=params)
 
-    if response.status_code != 200:
-        raise Exception(f"API error: {response.status_code}, {response.text}")
+def parse_odds(data):
+    """
+    Converts a raw OddsAPI response into {"Home vs Away": {"odds", "probabilities"}}.
+
+    Args:
+        data (list): Matches as returned by the OddsAPI odds endpoint.
 
-    data = response.json()
+    Returns:
+        dict: A dictionary of match odds and probabilities.
+    """
     odds_data = {}
 
     for match in data:
@@ -78,12 +111,6 @@ def get_odds(save_to_file=True):
             'probabilities': probs
         }
 
-    # Save to local JSON
-    if save_to_file:
-        os.makedirs('data', exist_ok=True)
-        with open('data/cached_odds.json', 'w') as f:
-            json.dump(odds_data, f, indent=4)
-
     return odds_data
 
 
@@ -102,6 +129,47 @@ def convert_to_probabilities(odds):
     return {k: v / total for k, v in raw_probs.items()}
 
 
+def normalize_team_name(name):
+    """
+    Normalizes a team name so OddsAPI names ("Brighton and Hove Albion") match
+    football-data names ("Brighton & Hove Albion FC").
+
+    Args:
+        name (str): Team name from either source.
+
+    Returns:
+        str: Lowercase name without club suffixes.
+    """
+    words = name.lower().replace("&", "and").split()
+    return " ".join(word for word in words if word not in ("fc", "afc"))
+
+
+def find_match_probabilities(odds_data, home_team, away_team):
+    """
+    Looks up the outcome probabilities for a fixture, tolerating naming differences.
+
+    Args:
+        odds_data (dict): Odds keyed by "Home vs Away", as returned by get_odds().
+        home_team (str): Home team name.
+        away_team (str): Away team name.
+
+    Returns:
+        dict: 'home', 'draw', 'away' probabilities (uniform if the match has no odds).
+    """
+    match_key = f"{home_team} vs {away_team}"
+    if match_key in odds_data:
+        return odds_data[match_key]["probabilities"]
+
+    target = (normalize_team_name(home_team), normalize_team_name(away_team))
+    for key, info in odds_data.items():
+        home, away = key.split(" vs ")
+        if (normalize_team_name(home), normalize_team_name(away)) == target:
+            return info["probabilities"]
+
+    # if no odds, fallback to equal probabilities (1/3 each outcome)
+    return {'home': 1/3, 'draw': 1/3, 'away': 1/3}
+
+
 if __name__ == "__main__":
     # Run this file directly to test
     odds = get_odds()
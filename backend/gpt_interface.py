@@ -1,16 +1,27 @@
-import openai
 import json
 import os
 from dotenv import load_dotenv
+from backend.metrics import timed
+from backend.league_config import get_league_config, survival_rank, DEFAULT_LEAGUE
 
 
 load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
 
 
-def call_gpt(prompt):
+def get_client():
+    """
+    Creates an OpenAI client. openai is the slowest import in the app (~0.7s),
+    so it is loaded here on the first GPT call (or by backend.prewarm) rather than at boot.
+    """
+    import openai
+    return openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+def call_gpt(prompt, league=DEFAULT_LEAGUE):
+    config = get_league_config(league)
     system_prompt = """
 You are an AI assistant that converts football season scenarios into structured JSON data.
+The league is the """ + config["name"] + """, with """ + str(config["num_teams"]) + """ teams.
 
 Given a user prompt about football fixtures and outcomes, return:
 
@@ -23,20 +34,21 @@ Given a user prompt about football fixtures and outcomes, return:
     }
 
 If the user mentions "winning the league", assume target_rank = 1.
-If the user mentions "avoiding relegation", assume target_rank = 17.
+If the user mentions "avoiding relegation", assume target_rank = """ + str(survival_rank(config)) + """.
 If the user mentions "top X", set target_rank to X.
 
 Respond ONLY with pure JSON. Do not add any extra text.
 """
-    client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0
-    )
+    client = get_client()
+    with timed("call_gpt"):
+        response = client.chat.completions.create(
+            model="gpt-3.5-turbo-0125",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0
+        )
     response_dict = response.model_dump()
     content = response_dict["choices"][0]["message"]["content"]
 
@@ -48,7 +60,8 @@ Respond ONLY with pure JSON. Do not add any extra text.
 
 
 
-def explain_solution(target_team, target_rank, solution_outcomes, fixed_outcomes, feasible, probability, odds_data=None):
+def explain_solution(target_team, target_rank, solution_outcomes, fixed_outcomes, feasible, probability, odds_data=None,
+                     objective="feasibility"):
     """
     Generates a comprehensive explanation of the playoff/league scenario.
 
@@ -60,6 +73,7 @@ def explain_solution(target_team, target_rank, solution_outcomes, fixed_outcomes
         feasible (bool): Whether the scenario is mathematically possible.
         probability (float): Monte Carlo estimated probability (real-world likelihood).
         odds_data (dict): Real-world odds for matches, used for deeper analysis.
+        objective (str): Solver objective; for "most_probable" only the path's upsets are passed.
 
     Returns:
         str: GPT-generated natural language explanation.
@@ -71,13 +85,18 @@ def explain_solution(target_team, target_rank, solution_outcomes, fixed_outcomes
     else:
         intro += f"❌ It is NOT mathematically possible for {target_team} to finish in the top {target_rank}.\n"
 
+    # the most probable path comes as its upsets only (see solver.build_result), a feasibility path in full
+    outcomes_note = ""
+    if objective == "most_probable":
+        outcomes_note = " Only the upsets are listed; every other match goes the way the bookmakers expect."
+
     # Build the system prompt for GPT
     system_prompt = """
 You are an expert sports analyst AI.
 
 Given:
 - The user's favorite team and target rank.
-- A list of required match outcomes for the target team to succeed.
+- A list of required match outcomes for the target team to succeed.""" + outcomes_note + """
 - Any user-specified forced outcomes (fixed results).
 - The estimated probability of this scenario happening (from Monte Carlo simulation).
 - Real-world match odds (for each game) indicating how likely the required outcomes are.
@@ -114,15 +133,16 @@ Keep the tone clear, insightful, and engaging, like a TV analyst explaining play
     }
 
     # Call OpenAI API (official SDK, gpt-3.5-turbo-0125 or upgrade to gpt-4 if desired)
-    client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": json.dumps(user_prompt)}
-        ],
-        temperature=0
-    )
+    client = get_client()
+    with timed("explain_solution"):
+        response = client.chat.completions.create(
+            model="gpt-3.5-turbo-0125",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": json.dumps(user_prompt)}
+            ],
+            temperature=0
+        )
 
     # Extract GPT response text
     content = response.model_dump()["choices"][0]["message"]["content"]
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from backend.data_loader import get_data_dir
+
+REQUEST_TIMEOUT = (5, 30)  # (connect, read) seconds, so a stalled API can't hang a refresh
+RETRY_TOTAL = 3  # retries on connection errors, 429 and 5xx
+RETRY_BACKOFF = 0.5  # seconds, doubled per retry (Retry-After is honoured when sent)
+POOL_SIZE = 8  # keep-alive connections per host
+VALIDATORS_FILE = "http_validators.json"  # ETag / Last-Modified per source, in the data dir
+
+_session = None
+_session_lock = threading.Lock()
+_validators_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Returns the process-wide requests.Session. Connections are pooled and kept alive
+    across calls and threads, and idempotent GETs are retried with backoff.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=RETRY_TOTAL,
+                backoff_factor=RETRY_BACKOFF,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+
+def fetch_json(url, params=None, headers=None, validators=None):
+    """
+    GETs a JSON payload over the shared session. If validators from an earlier
+    response are given, sends them as If-None-Match / If-Modified-Since so an
+    unchanged payload comes back as an empty 304.
+
+    Args:
+        url (str): Endpoint to fetch.
+        params (dict): Query parameters.
+        headers (dict): Extra request headers (e.g. API tokens).
+        validators (dict): {"etag", "last_modified"} saved from the previous response.
+
+    Returns:
+        tuple: (data, validators), data is None when the server answered 304 Not Modified.
+    """
+    headers = dict(headers or {})
+    validators = validators or {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = get_session().get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304:
+        return None, validators
+    response.raise_for_status()
+
+    return response.json(), {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified")
+    }
+
+
+def load_validators():
+    """
+    Loads the saved {source: {"etag", "last_modified"}} map, or {} if nothing was saved yet.
+    """
+    path = os.path.join(get_data_dir(), VALIDATORS_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_validators(updates):
+    """
+    Merges {source: validators} into the saved map. Call this only after the payload
+    has been written, otherwise a later 304 would skip data that was never stored.
+    """
+    with _validators_lock:
+        validators = load_validators()
+        validators.update(updates)
+        path = os.path.join(get_data_dir(), VALIDATORS_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(validators, f, indent=4)
+        os.replace(tmp_path, path)
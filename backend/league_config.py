@@ -0,0 +1,74 @@
+import os
+
+# per-league rules and data sources; add a league here to support it everywhere
+LEAGUES = {
+    "PL": {
+        "name": "Premier League",
+        "num_teams": 20,
+        "games_per_team": 38,
+        "points": {"win": 3, "draw": 1, "loss": 0},
+        "relegation_spots": 3,
+        "promotion_spots": 0,
+        "tiebreak_order": ["points", "goal_difference", "goals_for"],
+        "thresholds": {"title": 1, "top_4": 4, "top_5": 5, "top_7": 7},
+        "football_data_code": "PL",  # football-data.org competition code
+        "odds_sport_key": "soccer_epl",  # the-odds-api.com sport key
+        "data_prefix": "prem",  # data/<prefix>_standings.json, data/dummy_<prefix>_fixtures.json, ...
+        "odds_file": "cached_odds.json"
+    },
+    "ELC": {
+        "name": "Championship",
+        "num_teams": 24,
+        "games_per_team": 46,
+        "points": {"win": 3, "draw": 1, "loss": 0},
+        "relegation_spots": 3,
+        "promotion_spots": 2,  # automatic promotion, 3rd-6th go to the playoffs
+        "tiebreak_order": ["points", "goal_difference", "goals_for"],
+        "thresholds": {"title": 1, "playoffs": 6},
+        "football_data_code": "ELC",
+        "odds_sport_key": "soccer_efl_champ",
+        "data_prefix": "elc",
+        "odds_file": "cached_odds_elc.json"
+    }
+}
+
+DEFAULT_LEAGUE = os.getenv("LEAGUE", "PL")
+
+
+def get_league_config(league=None):
+    """
+    Returns the config for a league code (e.g. "PL", "ELC"), or passes a config dict through.
+    A dict only needs the keys it overrides; the rest come from the default league.
+
+    Args:
+        league (str or dict): League code, custom config, or None for DEFAULT_LEAGUE.
+
+    Returns:
+        dict: League config.
+    """
+    if league is None:
+        league = DEFAULT_LEAGUE
+    if isinstance(league, dict):
+        return {**LEAGUES[DEFAULT_LEAGUE], **league}
+    if league not in LEAGUES:
+        raise ValueError(f"Unknown league '{league}'. Use one of {list(LEAGUES)} or pass a config dict.")
+    return LEAGUES[league]
+
+
+def survival_rank(config):
+    """
+    Lowest finishing position that avoids relegation, e.g. 17 in a 20-team league with 3 going down.
+    """
+    return config["num_teams"] - config["relegation_spots"]
+
+
+def position_thresholds(config):
+    """
+    Named positions fans ask about (title, top 4, ..., promotion, survival) for the league.
+    """
+    thresholds = dict(config["thresholds"])
+    if config["promotion_spots"]:
+        thresholds["promotion"] = config["promotion_spots"]
+    if config["relegation_spots"]:
+        thresholds["survival"] = survival_rank(config)
+    return thresholds
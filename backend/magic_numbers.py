@@ -0,0 +1,155 @@
+import os
+from backend.data_loader import load_snapshot, load_json, save_json, get_data_dir, UNPLAYED_STATUSES, USE_DUMMY_DATA
+from backend.metrics import record_cache
+from backend.league_config import get_league_config, position_thresholds, DEFAULT_LEAGUE
+
+# in-process copy of the stored tables, keyed by snapshot version
+_magic_cache = {}
+
+
+def kth_largest_other(sorted_values, own_value, k):
+    """
+    Returns the k-th largest value among all teams except one, using a list shared by every team.
+
+    Args:
+        sorted_values (list): Values for every team, sorted descending.
+        own_value (int): The excluded team's value (present once in sorted_values).
+        k (int): 1-based rank to look up.
+
+    Returns:
+        int or None: The k-th largest of the other teams, or None if there are fewer than k.
+    """
+    if k > len(sorted_values) - 1:
+        return None
+
+    # removing the team shifts everything after it up one place
+    if own_value >= sorted_values[k - 1]:
+        return sorted_values[k]
+    return sorted_values[k - 1]
+
+
+def compute_magic_numbers(standings_df, fixtures_df, league=DEFAULT_LEAGUE):
+    """
+    Computes, for every team and threshold position, the points needed to guarantee it
+    and the points below which it becomes impossible.
+
+    Both numbers come from per-team bounds (current points and maximum reachable points),
+    sorted once and reused for every team, so no MILP solve is needed. The clinch number
+    treats ties as losses, so it is always sufficient; the elimination number treats ties
+    as still winnable on the tiebreak, so it is always necessary. Either can be slightly
+    loose when rivals still have to play each other.
+
+    Args:
+        standings_df (DataFrame): Current standings.
+        fixtures_df (DataFrame): Remaining fixtures.
+        league (str or dict): League code or config, for thresholds and points per win.
+
+    Returns:
+        dict: {team: {"points", "remaining", "max_points", "positions": {name: {...}}}}
+    """
+    config = get_league_config(league)
+    team_points = standings_df.set_index("team_name")["points"].to_dict()
+
+    # count remaining games per team
+    remaining = {team: 0 for team in team_points}
+    for _, row in fixtures_df.iterrows():
+        if row["status"] not in UNPLAYED_STATUSES:
+            continue
+        remaining[row["home_team_name"]] += 1
+        remaining[row["away_team_name"]] += 1
+
+    max_points = {team: team_points[team] + config["points"]["win"] * remaining[team] for team in team_points}
+
+    # shared bounds, sorted once for all teams
+    sorted_current = sorted(team_points.values(), reverse=True)
+    sorted_max = sorted(max_points.values(), reverse=True)
+
+    thresholds = position_thresholds(config)
+
+    table = {}
+    for team, points in team_points.items():
+        positions = {}
+        for name, rank in thresholds.items():
+            # guaranteed once fewer than `rank` rivals can still reach our total
+            rival_max = kth_largest_other(sorted_max, max_points[team], rank)
+            clinch_total = points if rival_max is None else max(points, rival_max + 1)
+
+            # impossible once `rank` rivals already have more than we can reach;
+            # drawing level with them can still be enough on the tiebreak
+            rival_current = kth_largest_other(sorted_current, points, rank)
+            needed_total = points if rival_current is None else max(points, rival_current)
+
+            clinch_points = clinch_total - points
+            elimination_points = needed_total - points
+            positions[name] = {
+                "rank": rank,
+                # None means it can't be guaranteed on the team's own results
+                "clinch_points": clinch_points if clinch_total <= max_points[team] else None,
+                "clinched": clinch_points == 0,
+                "elimination_points": elimination_points,
+                "eliminated": needed_total > max_points[team]
+            }
+
+        table[team] = {
+            "points": points,
+            "remaining": remaining[team],
+            "max_points": max_points[team],
+            "positions": positions
+        }
+
+    return table
+
+
+def get_magic_numbers_filename(dummy=USE_DUMMY_DATA, league=DEFAULT_LEAGUE):
+    prefix = get_league_config(league)["data_prefix"]
+    if dummy:
+        prefix = f"dummy_{prefix}"
+    return os.path.join(get_data_dir(), f"{prefix}_magic_numbers.json")
+
+
+def load_magic_numbers(dummy=USE_DUMMY_DATA, league=DEFAULT_LEAGUE):
+    """
+    Returns the magic-number table for the current snapshot, computing and storing it
+    next to the snapshot files if the stored copy is missing or stale.
+
+    Returns:
+        dict: {"version": snapshot hash, "teams": {team: {...}}}
+    """
+    # load_snapshot is cached in-process, so a lookup doesn't re-parse or re-hash the JSON
+    standings_df, fixtures_df, version = load_snapshot(dummy=dummy, league=league)
+
+    record_cache("magic_numbers", hit=version in _magic_cache)
+    if version in _magic_cache:
+        return _magic_cache[version]
+
+    filename = get_magic_numbers_filename(dummy, league)
+    stored = load_json(filename) if os.path.exists(filename) else None
+
+    if stored is None or stored.get("version") != version:
+        stored = {"version": version, "teams": compute_magic_numbers(standings_df, fixtures_df, league)}
+        save_json(stored, filename)
+
+    _magic_cache[version] = stored
+    return stored
+
+
+def get_magic_numbers(team_name, dummy=USE_DUMMY_DATA, league=DEFAULT_LEAGUE):
+    """
+    Looks up one team's row in the magic-number table.
+
+    Args:
+        team_name (str): Exact team name as it appears in the standings.
+
+    Returns:
+        dict: The team's points, remaining games and per-position thresholds.
+    """
+    teams = load_magic_numbers(dummy=dummy, league=league)["teams"]
+    if team_name not in teams:
+        raise ValueError(f"Team name '{team_name}' not recognized in league.")
+    return teams[team_name]
+
+
+if __name__ == "__main__":
+    table = load_magic_numbers()["teams"]
+    for team, row in table.items():
+        print(team, {name: (p["clinch_points"], p["elimination_points"]) for name, p in row["positions"].items()})
@@ -4,16 +4,10 @@ from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 import os
 
-from backend.api.solver import solve_scenario
+from backend.solver import solve_scenario
+from backend.prewarm import prewarm_lifespan
 
-app = FastAPI()
-
-# Serve React frontend (Render compatible)
-current_dir = os.path.dirname(os.path.abspath(__file__))
-frontend_build_path = os.path.join(current_dir, "../../frontend/build")
-
-if os.path.exists(frontend_build_path):
-    app.mount("/", StaticFiles(directory=frontend_build_path, html=True), name="frontend")
+app = FastAPI(lifespan=prewarm_lifespan)
 
 
 # Pydantic model for input
@@ -23,9 +17,17 @@ class ScenarioRequest(BaseModel):
 
 # API route
 @app.post("/simulate/")
-async def simulate(request: ScenarioRequest):
+def simulate(request: ScenarioRequest):
     # Use the user query directly with your solver
     result = solve_scenario(request.query)
     
     # Return the entire solver result as JSON
     return JSONResponse(result)
+
+
+# Serve React frontend (Render compatible), mounted last so it doesn't shadow the API route
+current_dir = os.path.dirname(os.path.abspath(__file__))
+frontend_build_path = os.path.join(current_dir, "../../frontend/build")
+
+if os.path.exists(frontend_build_path):
+    app.mount("/", StaticFiles(directory=frontend_build_path, html=True), name="frontend")
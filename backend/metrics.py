@@ -0,0 +1,143 @@
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# latency buckets in seconds, from a cached lookup up to a slow GPT call
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PROFILE_INTERVAL = 0.005  # seconds between profiler samples
+
+_lock = threading.Lock()
+_histograms = {}  # (stage, labels) -> {"buckets": [...], "sum": float, "count": int}
+_counters = {}  # (name, labels) -> int
+
+# per-request list of (stage, seconds), read back for the Server-Timing header
+_request_timings = ContextVar("request_timings", default=None)
+
+
+def observe(stage, seconds, **labels):
+    """
+    Records one duration for a stage in its histogram and in the current request's timings.
+    """
+    key = (stage, tuple(sorted(labels.items())))
+    with _lock:
+        hist = _histograms.setdefault(key, {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0})
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist["buckets"][i] += 1
+        hist["sum"] += seconds
+        hist["count"] += 1
+
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+@contextmanager
+def timed(stage, **labels):
+    """
+    Times the wrapped block as a stage, e.g. `with timed("milp_solve", backend="highs"):`.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start, **labels)
+
+
+def increment(name, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + 1
+
+
+def record_cache(cache, hit):
+    """
+    Counts a cache lookup as a hit or miss, e.g. record_cache("monte_carlo", hit=False).
+    """
+    increment("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def render_metrics():
+    """
+    Renders every histogram and counter in the Prometheus text exposition format.
+    """
+    lines = ["# TYPE league_stage_seconds histogram"]
+    with _lock:
+        for (stage, labels), hist in sorted(_histograms.items()):
+            labels = (("stage", stage),) + labels
+            for bound, count in zip(BUCKETS, hist["buckets"]):
+                lines.append(f"league_stage_seconds_bucket{_format_labels(labels, [('le', bound)])} {count}")
+            lines.append(f"league_stage_seconds_bucket{_format_labels(labels, [('le', '+Inf')])} {hist['count']}")
+            lines.append(f"league_stage_seconds_sum{_format_labels(labels)} {hist['sum']}")
+            lines.append(f"league_stage_seconds_count{_format_labels(labels)} {hist['count']}")
+
+        lines.append("# TYPE league_cache_requests_total counter")
+        for (name, labels), value in sorted(_counters.items()):
+            lines.append(f"league_{name}{_format_labels(labels)} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def start_request_timing():
+    """
+    Starts collecting stage timings for the current request and returns the list they land in.
+    """
+    timings = []
+    _request_timings.set(timings)
+    return timings
+
+
+def server_timing_header(timings, total_seconds):
+    """
+    Builds a Server-Timing header value, summing repeated stages (e.g. k-best solves).
+    """
+    totals = {}
+    for stage, seconds in timings:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in totals.items()]
+    entries.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(entries)
+
+
+@contextmanager
+def sample_profile(interval=PROFILE_INTERVAL, top=25):
+    """
+    Opt-in sampling profiler for a single request. A background thread samples the calling
+    thread's stack every `interval` seconds; on exit the yielded dict holds the sample count
+    and the most frequent collapsed stacks ("outer;inner;leaf").
+    """
+    target_thread = threading.get_ident()
+    stacks = Counter()
+    stop = threading.Event()
+
+    def sampler():
+        while not stop.wait(interval):
+            frame = sys._current_frames().get(target_thread)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                frame = frame.f_back
+            stacks[";".join(reversed(names))] += 1
+
+    profile = {}
+    thread = threading.Thread(target=sampler, daemon=True)
+    thread.start()
+    try:
+        yield profile
+    finally:
+        stop.set()
+        thread.join()
+        profile["interval"] = interval
+        profile["samples"] = sum(stacks.values())
+        profile["stacks"] = [{"stack": stack, "count": count} for stack, count in stacks.most_common(top)]
@@ -1,15 +1,23 @@
 import random
-from backend.get_odds import get_odds
+from operator import itemgetter
+from backend.get_odds import get_odds, find_match_probabilities
 import pickle
 import os
 import json
 import hashlib
+import numpy as np
+from backend.metrics import timed
+from backend.data_loader import UNPLAYED_STATUSES
+from backend.league_config import get_league_config, DEFAULT_LEAGUE
 
 # set number of simulations
 NUM_SIMULATIONS = 10000
 
+# outcome codes used by the vectorized engine: 0 = home, 1 = draw, 2 = away
+OUTCOMES = ['home', 'draw', 'away']
 
-def simulate_remaining_season(odds_data, base_table, fixtures, user_goal_check, fixed_outcomes):
+
+def simulate_remaining_season(odds_data, base_table, fixtures, user_goal_check, fixed_outcomes, league=DEFAULT_LEAGUE):
     """
     Simulates one version of the remaining season using match odds and user constraints.
 
@@ -19,6 +27,7 @@ def simulate_remaining_season(odds_data, base_table, fixtures, user_goal_check,
         fixtures (list): Remaining matches as tuples (home, away)
         user_goal_check (function): Function to check if the user goal is met
         fixed_outcomes (dict): User-specified fixed match outcomes, e.g., {"Arsenal vs Man City": "home"}
+        league (str or dict): League code or config, for points rules and tiebreaks
 
     Returns:
         bool: True if the user goal is met in this simulation, False otherwise
@@ -45,7 +54,7 @@ def simulate_remaining_season(odds_data, base_table, fixtures, user_goal_check,
         simulated_results[match_key] = outcome
 
     # apply simulation results and fixed outcomes to the table
-    final_table = apply_simulation(base_table, simulated_results, fixed_outcomes)
+    final_table = apply_simulation(base_table, simulated_results, fixed_outcomes, league)
 
     # check if user goal is met in this simulated season
     return user_goal_check(final_table)
@@ -71,7 +80,8 @@ def make_user_goal_check(target_team, target_rank):
     return user_goal_check
 
 
-def run_monte_carlo(target_team, target_rank, fixed_outcomes, standings_df, fixtures_df, num_simulations=NUM_SIMULATIONS):
+def run_monte_carlo(target_team, target_rank, fixed_outcomes, standings_df, fixtures_df, num_simulations=NUM_SIMULATIONS,
+                    league=DEFAULT_LEAGUE, odds_data=None):
     """
     Runs full Monte Carlo simulation loop to estimate probability of user-defined scenario.
 
@@ -80,27 +90,37 @@ def run_monte_carlo(target_team, target_rank, fixed_outcomes, standings_df, fixt
         target_rank (int): Desired rank (e.g., top 4 = 4)
         fixed_outcomes (dict): Forced outcomes, e.g., {"Arsenal vs Man City": "home"}
         num_simulations (int): Number of Monte Carlo runs (default = 10,000)
+        league (str or dict): League code or config, see backend.league_config
+        odds_data (dict): Match odds; fetched with get_odds() if not given
 
     Returns:
         float: Estimated probability of the user scenario happening
     """
 
-    # load match odds from cached_odds.json via get_odds
-    odds_data = get_odds()
+    if odds_data is None:
+        odds_data = get_odds(league=league)
 
     # load current standings and fixtures from solver
     base_table, fixtures = load_current_state(standings_df, fixtures_df)
 
+    # resolve each fixture's odds once with the same name-tolerant lookup as build_league_arrays,
+    # so this loop and the vectorized engine simulate the same probabilities
+    fixture_odds = {
+        f"{home} vs {away}": {"probabilities": find_match_probabilities(odds_data, home, away)}
+        for home, away in fixtures
+    }
+
     # create the user goal check function (e.g., "Arsenal finishes top 4")
     user_goal_check = make_user_goal_check(target_team, target_rank)
 
     success_count = 0
 
     # run the simulations
-    for i in range(num_simulations):
-        success = simulate_remaining_season(odds_data, base_table, fixtures, user_goal_check, fixed_outcomes)
-        if success:
-            success_count += 1
+    with timed("simulation", engine="loop"):
+        for i in range(num_simulations):
+            success = simulate_remaining_season(fixture_odds, base_table, fixtures, user_goal_check, fixed_outcomes, league)
+            if success:
+                success_count += 1
 
     # calculate the probability as number of successes over total sims
     probability = success_count / num_simulations
@@ -117,15 +137,18 @@ def load_current_state(standings_df, fixtures_df):
     Uses standings_df and fixtures_df to prepare data for Monte Carlo.
 
     Returns:
-        base_table (dict): Current standings as {team: {points, position}}
+        base_table (dict): Current standings as {team: {points, position, goal_difference, goals_for}}
         fixtures (list): Remaining matches as (home_team, away_team)
     """
 
     # build base_table from standings_df
     base_table = {
         row["team_name"]: {
-            "points": row["points"],
-            "position": row["position"]
+            # plain ints, numpy scalars make the per-season table updates several times slower
+            "points": int(row["points"]),
+            "position": int(row["position"]),
+            "goal_difference": int(row["goal_difference"]),
+            "goals_for": int(row["goals_for"])
         }
         for _, row in standings_df.iterrows()
     }
@@ -134,13 +157,13 @@ def load_current_state(standings_df, fixtures_df):
     fixtures = [
         (row["home_team_name"], row["away_team_name"])
         for _, row in fixtures_df.iterrows()
-        if row["status"] == "SCHEDULED"
+        if row["status"] in UNPLAYED_STATUSES
     ]
 
     return base_table, fixtures
 
 
-def apply_simulation(base_table, simulated_results, fixed_outcomes):
+def apply_simulation(base_table, simulated_results, fixed_outcomes, league=DEFAULT_LEAGUE):
     """
     Applies simulated results and user constraints to the base league table.
 
@@ -148,10 +171,14 @@ def apply_simulation(base_table, simulated_results, fixed_outcomes):
         base_table (dict): Current standings {team: {points, position, goal_difference (optional)}}
         simulated_results (dict): Random simulated match outcomes
         fixed_outcomes (dict): User-forced outcomes, e.g., {"Arsenal vs Man City": "home"}
+        league (str or dict): League code or config, for points rules and tiebreak order
 
     Returns:
         sim_table (dict): Final standings with updated points and positions
     """
+    config = get_league_config(league)
+    win, draw, loss = (config["points"][key] for key in ("win", "draw", "loss"))
+    tiebreak_order = config["tiebreak_order"]
 
     # make a copy of base_table to not overwrite original
     sim_table = {team: data.copy() for team, data in base_table.items()}
@@ -168,18 +195,28 @@ def apply_simulation(base_table, simulated_results, fixed_outcomes):
 
         # assign points based on result
         if result == "home":
-            sim_table[home]["points"] += 3
+            sim_table[home]["points"] += win
+            if loss:
+                sim_table[away]["points"] += loss
         elif result == "away":
-            sim_table[away]["points"] += 3
+            sim_table[away]["points"] += win
+            if loss:
+                sim_table[home]["points"] += loss
         elif result == "draw":
-            sim_table[home]["points"] += 1
-            sim_table[away]["points"] += 1
+            sim_table[home]["points"] += draw
+            sim_table[away]["points"] += draw
         else:
             raise ValueError(f"Unknown result: {result}")
 
-    # sort league by points (and goal difference if available)
-    sorted_teams = sorted(sim_table.items(),
-                          key=lambda x: (-x[1]["points"], -x[1].get("goal_difference", 0)))
+    # sort league by the tiebreak order (points, then goal difference etc.), highest first;
+    # reverse=True keeps fully tied teams in table order, as the stable ascending sort did
+    tiebreak_key = itemgetter(*tiebreak_order)
+    try:
+        sorted_teams = sorted(sim_table.items(), key=lambda x: tiebreak_key(x[1]), reverse=True)
+    except KeyError:
+        # hand-built tables may lack goal difference etc., count a missing field as 0
+        sorted_teams = sorted(sim_table.items(), key=lambda x: tuple(x[1].get(key, 0) for key in tiebreak_order),
+                              reverse=True)
 
     # assign new positions
     for pos, (team, data) in enumerate(sorted_teams, start=1):
@@ -188,23 +225,232 @@ def apply_simulation(base_table, simulated_results, fixed_outcomes):
     return sim_table
 
 
+def build_league_arrays(standings_df, fixtures_df, odds_data, league=DEFAULT_LEAGUE):
+    """
+    Converts standings and remaining fixtures into integer-indexed arrays for the vectorized engine.
+
+    Args:
+        standings_df (DataFrame): Current standings.
+        fixtures_df (DataFrame): Fixtures (only unplayed ones are kept, see UNPLAYED_STATUSES).
+        odds_data (dict): Match odds from get_odds().
+        league (str or dict): League code or config, for points rules and tiebreak order
+
+    Returns:
+        dict: teams, base_points, tiebreak_order, points, match_keys, home_idx, away_idx, matchday, probs
+    """
+    config = get_league_config(league)
+    teams = standings_df["team_name"].tolist()
+    team_index = {team: i for i, team in enumerate(teams)}
+
+    # tiebreaks after points (goal difference etc.) don't change in simulation,
+    # so precompute a stable order; lexsort uses the last key first
+    tiebreak_keys = [np.arange(len(teams))]
+    for key in reversed(config["tiebreak_order"]):
+        if key != "points":
+            tiebreak_keys.append(-standings_df[key].to_numpy())
+    order = np.lexsort(tiebreak_keys)
+    tiebreak_order = np.empty(len(teams), dtype=np.int64)
+    tiebreak_order[order] = np.arange(len(teams))
+
+    scheduled = fixtures_df[fixtures_df["status"].isin(UNPLAYED_STATUSES)]
+    match_keys = []
+    probs = []
+    for _, row in scheduled.iterrows():
+        home, away = row["home_team_name"], row["away_team_name"]
+        match_keys.append(f"{home} vs {away}")
+        p = find_match_probabilities(odds_data, home, away)
+        probs.append([p['home'], p['draw'], p['away']])
+
+    return {
+        "teams": teams,
+        "base_points": standings_df["points"].to_numpy(dtype=np.int16),
+        "tiebreak_order": tiebreak_order,
+        "points": config["points"],
+        "match_keys": match_keys,
+        "home_idx": np.array([team_index[t] for t in scheduled["home_team_name"]], dtype=np.int64),
+        "away_idx": np.array([team_index[t] for t in scheduled["away_team_name"]], dtype=np.int64),
+        "matchday": scheduled["matchday"].to_numpy(),
+        "probs": np.array(probs, dtype=np.float64).reshape(-1, 3)
+    }
+
+
+def sample_outcomes(probs, num_simulations, rng):
+    """
+    Samples every remaining fixture for num_simulations seasons at once.
+
+    Args:
+        probs (ndarray): (fixtures, 3) home/draw/away probabilities.
+        num_simulations (int): Number of seasons to sample.
+        rng (Generator): numpy random generator.
+
+    Returns:
+        ndarray: (num_simulations, fixtures) uint8 outcome codes.
+    """
+    cumulative = np.cumsum(probs, axis=1)
+    cumulative /= cumulative[:, -1:]
+    u = rng.random((num_simulations, probs.shape[0]))
+    return ((u >= cumulative[:, 0]).astype(np.uint8) + (u >= cumulative[:, 1]))
+
+
+def apply_fixed_outcomes(outcomes, match_keys, fixed_outcomes):
+    """
+    Overwrites sampled columns with user-forced results, e.g. {"Arsenal vs Man City": "home"}.
+    """
+    for col, match_key in enumerate(match_keys):
+        if match_key in fixed_outcomes:
+            outcomes[:, col] = OUTCOMES.index(fixed_outcomes[match_key])
+    return outcomes
+
+
+def rank_positions(points, tiebreak_order):
+    """
+    Converts points arrays (..., teams) into 1-based league positions, breaking ties by goal difference.
+    """
+    num_teams = points.shape[-1]
+    sort_key = -points.astype(np.int64) * num_teams + tiebreak_order
+    order = np.argsort(sort_key, axis=-1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(1, num_teams + 1), axis=-1)
+    return positions
+
+
+def fixture_incidence(league):
+    """
+    Builds (fixtures, teams) home and away incidence matrices, so a matmul scatters
+    points to teams even if a team plays twice in a round.
+    """
+    num_fixtures = len(league["match_keys"])
+    home_inc = np.zeros((num_fixtures, len(league["teams"])), dtype=np.float32)
+    away_inc = np.zeros_like(home_inc)
+    home_inc[np.arange(num_fixtures), league["home_idx"]] = 1
+    away_inc[np.arange(num_fixtures), league["away_idx"]] = 1
+    return home_inc, away_inc
+
+
+def final_points(outcomes, league, incidence=None):
+    """
+    Final points for every team in every simulated season.
+
+    Args:
+        outcomes (ndarray): (simulations, fixtures) outcome codes.
+        league (dict): Arrays from build_league_arrays().
+        incidence (tuple): Optional precomputed fixture_incidence(league), reused across chunks.
+
+    Returns:
+        ndarray: (simulations, teams) points.
+    """
+    home_inc, away_inc = incidence if incidence is not None else fixture_incidence(league)
+
+    win, draw_pts, loss = (league["points"][key] for key in ("win", "draw", "loss"))
+
+    # start from an away win everywhere and correct for home wins and draws,
+    # two comparisons and two matmuls instead of indexing a points table per outcome
+    home_win = (outcomes == 0).astype(np.float32)
+    draw = (outcomes == 1).astype(np.float32)
+    gains = (
+        win * away_inc.sum(axis=0) + loss * home_inc.sum(axis=0)
+        + home_win @ ((win - loss) * (home_inc - away_inc))
+        + draw @ ((draw_pts - loss) * home_inc + (draw_pts - win) * away_inc)
+    )
+    return league["base_points"] + gains.astype(np.int16)
+
+
+def matchday_points(outcomes, league):
+    """
+    Cumulative points for every team after each remaining matchday, via prefix sums.
+
+    Args:
+        outcomes (ndarray): (simulations, fixtures) outcome codes.
+        league (dict): Arrays from build_league_arrays().
+
+    Returns:
+        tuple: (matchdays, points) where points is (simulations, matchdays, teams).
+    """
+    num_teams = len(league["teams"])
+    matchdays = np.unique(league["matchday"])
+
+    points = league["points"]
+    home_pts = np.array([points["win"], points["draw"], points["loss"]], dtype=np.float32)[outcomes]
+    away_pts = np.array([points["loss"], points["draw"], points["win"]], dtype=np.float32)[outcomes]
+    home_inc, away_inc = fixture_incidence(league)
+
+    gains = np.zeros((outcomes.shape[0], len(matchdays), num_teams), dtype=np.int16)
+    for m, matchday in enumerate(matchdays):
+        cols = league["matchday"] == matchday
+        gains[:, m, :] = home_pts[:, cols] @ home_inc[cols] + away_pts[:, cols] @ away_inc[cols]
+
+    points = league["base_points"] + np.cumsum(gains, axis=1, dtype=np.int16)
+    return matchdays, points
+
+
+def run_trajectory(target_team, target_rank, fixed_outcomes, standings_df, fixtures_df,
+                   num_simulations=NUM_SIMULATIONS, odds_data=None, seed=None, league=DEFAULT_LEAGUE):
+    """
+    Simulates the remaining season once and reports the target team's position distribution
+    after every remaining matchday.
+
+    Args:
+        target_team (str): Team the user wants to track
+        target_rank (int): Desired rank (e.g., top 4 = 4)
+        fixed_outcomes (dict): Forced outcomes, e.g., {"Arsenal vs Man City": "home"}
+        num_simulations (int): Number of simulated seasons (default = 10,000)
+        odds_data (dict): Match odds; fetched with get_odds() if not given
+        seed (int): Optional seed for reproducible samples
+        league (str or dict): League code or config, see backend.league_config
+
+    Returns:
+        list: One entry per matchday with the position distribution and top-N probability
+    """
+    if odds_data is None:
+        odds_data = get_odds(league=league)
+
+    league_arrays = build_league_arrays(standings_df, fixtures_df, odds_data, league)
+    team_idx = league_arrays["teams"].index(target_team)
+
+    with timed("simulation", engine="trajectory"):
+        rng = np.random.default_rng(seed)
+        outcomes = sample_outcomes(league_arrays["probs"], num_simulations, rng)
+        outcomes = apply_fixed_outcomes(outcomes, league_arrays["match_keys"], fixed_outcomes)
+
+        matchdays, points = matchday_points(outcomes, league_arrays)
+        positions = rank_positions(points, league_arrays["tiebreak_order"])[:, :, team_idx]
+
+    trajectory = []
+    num_teams = len(league_arrays["teams"])
+    for m, matchday in enumerate(matchdays):
+        counts = np.bincount(positions[:, m], minlength=num_teams + 1)[1:]
+        distribution = counts / num_simulations
+        trajectory.append({
+            "matchday": int(matchday),
+            "position_distribution": distribution.tolist(),
+            "probability": float(distribution[:target_rank].sum())
+        })
+
+    return trajectory
+
+
 def save_sim(data, filename):
     ensure_folder_exists(filename)
-    with open(filename, 'wb') as f:
+    with timed("cache_io", op="save"), open(filename, 'wb') as f:
         pickle.dump(data, f)
 
 def load_sim(filename):
     if os.path.exists(filename):
-        with open(filename, 'rb') as f:
+        with timed("cache_io", op="load"), open(filename, 'rb') as f:
             return pickle.load(f)
     else:
         return None
 
-def get_cache_filename(target_team, target_rank, fixed_outcomes_mc):
+def get_cache_filename(target_team, target_rank, fixed_outcomes_mc, version, odds_data, league=DEFAULT_LEAGUE):
+    # the league rules, snapshot version and odds are part of the key, so a refresh,
+    # switching DUMMY_DATA or another league never serves a stale probability
     key_string = json.dumps({
         "team": target_team,
         "rank": target_rank,
-        "fixed_outcomes": fixed_outcomes_mc
+        "fixed_outcomes": fixed_outcomes_mc,
+        "league": get_league_config(league),
+        "version": version,
+        "odds": odds_data
     }, sort_keys=True)
 
     key_hash = hashlib.md5(key_string.encode()).hexdigest()
@@ -0,0 +1,84 @@
+import importlib
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from backend.metrics import observe
+from backend.league_config import DEFAULT_LEAGUE
+
+# set PREWARM=0 to skip warming (e.g. for one-off scripts importing the app)
+PREWARM_ENABLED = os.getenv("PREWARM", "1") != "0"
+
+# modules the request path imports lazily, slowest first
+HEAVY_MODULES = ["openai", "scipy.optimize", "pandas", "pulp"]
+
+# set once prewarm() finishes, reported by the /health route
+prewarmed = threading.Event()
+prewarm_timings = {}
+
+
+def warm_solver(standings_df, fixtures_df, odds_data, league=DEFAULT_LEAGUE):
+    """
+    Runs one cheap, always-feasible solve (top team finishing anywhere) so the solver
+    backend is loaded and initialised before the first real query.
+    """
+    from backend.get_odds import find_match_probabilities
+    from backend.solver import solve_paths
+
+    team_points = standings_df.set_index("team_name")["points"].to_dict()
+    match_probs = {
+        row["match_id"]: find_match_probabilities(odds_data, row["home_team_name"], row["away_team_name"])
+        for _, row in fixtures_df.iterrows()
+    }
+    solve_paths(fixtures_df, team_points, standings_df["team_name"].iloc[0], len(team_points), [], match_probs,
+                league=league)
+
+
+def prewarm(league=DEFAULT_LEAGUE):
+    """
+    Pays the cold-start costs of the first request up front: the lazy heavy imports,
+    parsing the league snapshot and cached odds, and one small solve on the default
+    backend. Each step is observed as a "prewarm" stage in /metrics.
+
+    Args:
+        league (str or dict): League code or config to warm the snapshot for.
+
+    Returns:
+        dict: Seconds spent per step.
+    """
+    from backend.data_loader import load_snapshot, load_cached_odds, USE_DUMMY_DATA
+
+    def step(name, fn):
+        start = time.perf_counter()
+        result = None
+        try:
+            result = fn()
+        except Exception as e:
+            # a failed step only means the first request pays for it instead
+            print(f"Prewarm step '{name}' failed: {e}")
+        prewarm_timings[name] = time.perf_counter() - start
+        observe("prewarm", prewarm_timings[name], step=name)
+        return result
+
+    for module in HEAVY_MODULES:
+        step(f"import_{module}", lambda: importlib.import_module(module))
+
+    snapshot = step("snapshot", lambda: load_snapshot(dummy=USE_DUMMY_DATA, league=league))
+    odds_data = step("odds", lambda: load_cached_odds(league))
+    if snapshot is not None:
+        standings_df, fixtures_df, version = snapshot
+        step("solver", lambda: warm_solver(standings_df, fixtures_df, odds_data or {}, league))
+
+    prewarmed.set()
+    return dict(prewarm_timings)
+
+
+@asynccontextmanager
+async def prewarm_lifespan(app):
+    """
+    FastAPI lifespan that starts prewarm() in a background thread, so the worker accepts
+    connections right away and requests arriving mid-warm-up just do the remaining work themselves.
+    """
+    if PREWARM_ENABLED:
+        threading.Thread(target=prewarm, name="prewarm", daemon=True).start()
+    yield
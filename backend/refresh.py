@@ -0,0 +1,238 @@
+"""
+Refreshes a league's standings, fixtures and odds in one pass:
+
+    python -m backend.refresh                  # default league (LEAGUE env var, PL)
+    python -m backend.refresh --league ELC --force
+    python -m backend.refresh --snapshot-only  # rebuild the binary snapshot from the JSON on disk
+
+Sources are fetched concurrently over the pooled session in backend.http_client,
+with ETag / If-Modified-Since so unchanged payloads are skipped. Everything is
+validated before anything is written, then the JSON files and the binary snapshot
+(see data_loader.write_binary_snapshot) are replaced.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from backend.data_loader import (
+    get_data_files, get_snapshot_file, get_odds_file, load_json, save_json, write_binary_snapshot
+)
+from backend.get_data import get_standings_url, get_fixtures_url, headers as football_data_headers
+from backend.get_odds import get_odds_request, parse_odds
+from backend.http_client import fetch_json, load_validators, save_validators
+from backend.league_config import get_league_config, DEFAULT_LEAGUE
+from backend.metrics import timed
+
+SOURCES = ("standings", "fixtures", "odds")
+MAX_WORKERS = len(SOURCES)  # one connection per source
+
+
+def validate_standings(standings_json, config):
+    """
+    Checks a standings payload is a complete, consistent table for the league.
+
+    Returns:
+        list: Team ids in table order.
+
+    Raises:
+        ValueError: If the table is malformed.
+    """
+    try:
+        table = standings_json["standings"][0]["table"]
+    except (KeyError, IndexError, TypeError):
+        raise ValueError("Standings payload has no table.")
+
+    if len(table) != config["num_teams"]:
+        raise ValueError(f"{config['name']} should have {config['num_teams']} teams, standings have {len(table)}.")
+
+    team_ids = []
+    for entry in table:
+        name = entry.get("team", {}).get("name")
+        for key in ("playedGames", "won", "draw", "lost", "goalsFor", "goalsAgainst", "position"):
+            if not isinstance(entry.get(key), int) or entry[key] < 0:
+                raise ValueError(f"Standings entry for {name} has an invalid '{key}'.")
+        # points aren't checked against results, deductions make them legitimately differ
+        if not isinstance(entry.get("points"), int) or not isinstance(entry.get("goalDifference"), int):
+            raise ValueError(f"Standings entry for {name} has invalid points or goal difference.")
+        if entry["won"] + entry["draw"] + entry["lost"] != entry["playedGames"]:
+            raise ValueError(f"Standings entry for {name} doesn't add up to its games played.")
+        team_ids.append(entry["team"]["id"])
+
+    if len(set(team_ids)) != len(team_ids):
+        raise ValueError("Standings list a team more than once.")
+    return team_ids
+
+
+def validate_fixtures(fixtures_json, team_ids):
+    """
+    Checks every fixture is between two different teams from the standings.
+
+    Raises:
+        ValueError: If a fixture is malformed or references an unknown team.
+    """
+    matches = fixtures_json.get("matches")
+    if not isinstance(matches, list):
+        raise ValueError("Fixtures payload has no matches.")
+
+    known = set(team_ids)
+    match_ids = set()
+    for match in matches:
+        home, away = match["homeTeam"]["id"], match["awayTeam"]["id"]
+        if home not in known or away not in known:
+            raise ValueError(f"Fixture {match['id']} references a team missing from the standings.")
+        if home == away:
+            raise ValueError(f"Fixture {match['id']} has a team playing itself.")
+        if not isinstance(match.get("matchday"), int):
+            raise ValueError(f"Fixture {match['id']} has no matchday.")
+        if match["id"] in match_ids:
+            raise ValueError(f"Fixture {match['id']} is listed more than once.")
+        match_ids.add(match["id"])
+
+
+def validate_odds(odds_data):
+    """
+    Checks each match's probabilities are in [0, 1] and sum to 1.
+
+    Raises:
+        ValueError: If a match has unusable probabilities.
+    """
+    for match_key, info in odds_data.items():
+        probs = info["probabilities"]
+        if set(probs) != {"home", "draw", "away"} or any(not 0 <= p <= 1 for p in probs.values()):
+            raise ValueError(f"Odds for {match_key} have invalid probabilities.")
+        if abs(sum(probs.values()) - 1) > 1e-6:
+            raise ValueError(f"Odds for {match_key} don't sum to 1.")
+
+
+def source_requests(league=DEFAULT_LEAGUE):
+    """
+    Returns {source: (url, params, headers)} for each upstream payload of a league.
+    """
+    odds_url, odds_params = get_odds_request(league)
+    return {
+        "standings": (get_standings_url(league), None, football_data_headers),
+        "fixtures": (get_fixtures_url(league), None, football_data_headers),
+        "odds": (odds_url, odds_params, None)
+    }
+
+
+def source_files(league=DEFAULT_LEAGUE):
+    """
+    Returns {source: path} where each source's payload is stored.
+    """
+    standings_file, fixtures_file = get_data_files(league, dummy=False)
+    return {"standings": standings_file, "fixtures": fixtures_file, "odds": get_odds_file(league)}
+
+
+def fetch_sources(league=DEFAULT_LEAGUE, force=False, max_workers=MAX_WORKERS):
+    """
+    Fetches every source concurrently, sending the validators saved by the last refresh
+    unless force is set or the stored copy is missing.
+
+    Returns:
+        dict: {source: (data or None if unchanged, validators)}
+    """
+    prefix = get_league_config(league)["data_prefix"]
+    saved = {} if force else load_validators()
+    files = source_files(league)
+
+    def fetch(source, url, params, headers):
+        validators = saved.get(f"{prefix}_{source}") if os.path.exists(files[source]) else None
+        with timed("refresh_fetch", source=source):
+            return fetch_json(url, params=params, headers=headers, validators=validators)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            source: pool.submit(fetch, source, url, params, headers)
+            for source, (url, params, headers) in source_requests(league).items()
+        }
+        return {source: future.result() for source, future in futures.items()}
+
+
+def refresh(league=DEFAULT_LEAGUE, force=False, max_workers=MAX_WORKERS):
+    """
+    Runs the full refresh for a league. Nothing is written unless every changed
+    payload validates, so a bad upstream response never replaces good data.
+
+    Args:
+        league (str or dict): League code or config, see backend.league_config.
+        force (bool): Ignore saved ETag / Last-Modified and refetch everything.
+        max_workers (int): Concurrent fetches.
+
+    Returns:
+        dict: {"standings"/"fixtures"/"odds": "updated" or "unchanged",
+               "snapshot": version written or None, "seconds": float}
+    """
+    start = time.perf_counter()
+    config = get_league_config(league)
+    results = fetch_sources(league, force, max_workers)
+
+    files = source_files(league)
+    standings_json = results["standings"][0]
+    fixtures_json = results["fixtures"][0]
+    odds_raw = results["odds"][0]
+
+    # validate the new payloads, against the stored copy of anything unchanged
+    with timed("refresh_validate"):
+        current_standings = standings_json if standings_json is not None else load_json(files["standings"])
+        current_fixtures = fixtures_json if fixtures_json is not None else load_json(files["fixtures"])
+        team_ids = validate_standings(current_standings, config)
+        validate_fixtures(current_fixtures, team_ids)
+        odds_data = None
+        if odds_raw is not None:
+            odds_data = parse_odds(odds_raw)
+            validate_odds(odds_data)
+
+    report = {source: "unchanged" if results[source][0] is None else "updated" for source in SOURCES}
+    updated_validators = {}
+    with timed("refresh_write"):
+        if standings_json is not None:
+            save_json(standings_json, files["standings"])
+        if fixtures_json is not None:
+            save_json(fixtures_json, files["fixtures"])
+        if odds_data is not None:
+            save_json(odds_data, files["odds"])
+
+        # binary snapshot last, so its mtime marks it as current for load_snapshot()
+        report["snapshot"] = None
+        snapshot_file = get_snapshot_file(league, dummy=False)
+        if standings_json is not None or fixtures_json is not None or not os.path.exists(snapshot_file):
+            report["snapshot"] = write_binary_snapshot(current_standings, current_fixtures, snapshot_file)
+
+        for source in SOURCES:
+            if results[source][0] is not None:
+                updated_validators[f"{config['data_prefix']}_{source}"] = results[source][1]
+        save_validators(updated_validators)
+
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def rebuild_snapshot(league=DEFAULT_LEAGUE, dummy=False):
+    """
+    Writes the binary snapshot from the JSON files already on disk. These are trusted
+    as-is (the dummy data is hand-edited), only upstream payloads are validated.
+
+    Returns:
+        str: Snapshot version.
+    """
+    standings_file, fixtures_file = get_data_files(league, dummy)
+    standings_json, fixtures_json = load_json(standings_file), load_json(fixtures_file)
+    return write_binary_snapshot(standings_json, fixtures_json, get_snapshot_file(league, dummy))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--league", default=DEFAULT_LEAGUE, help="league code from backend.league_config")
+    parser.add_argument("--force", action="store_true", help="ignore ETag / Last-Modified and refetch everything")
+    parser.add_argument("--snapshot-only", action="store_true", help="only rebuild the binary snapshot from disk")
+    parser.add_argument("--dummy", action="store_true", help="with --snapshot-only, use the dummy data files")
+    args = parser.parse_args()
+
+    if args.snapshot_only:
+        print(f"Snapshot {rebuild_snapshot(args.league, args.dummy)} written to {get_snapshot_file(args.league, args.dummy)}")
+    else:
+        report = refresh(args.league, force=args.force)
+        for source in SOURCES:
+            print(f"{source}: {report[source]}")
+        print(f"snapshot: {report['snapshot'] or 'unchanged'} ({report['seconds']:.2f}s)")
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import uuid
+from functools import lru_cache
+import numpy as np
+from backend.data_loader import load_json, save_json
+from backend.monte_carlo import (
+    sample_outcomes, fixture_incidence, final_points, rank_positions, OUTCOMES, ensure_folder_exists
+)
+
+# every fixture outcome (0 = home, 1 = draw, 2 = away) fits in 2 bits, so 4 fixtures per byte
+OUTCOMES_PER_BYTE = 4
+CHUNK_SIZE = 100000  # seasons per chunk when writing or scanning
+
+
+def pack_outcomes(outcomes):
+    """
+    Packs (seasons, fixtures) outcome codes into (seasons, ceil(fixtures / 4)) uint8 bytes.
+    """
+    num_seasons, num_fixtures = outcomes.shape
+    padded_fixtures = -(-num_fixtures // OUTCOMES_PER_BYTE) * OUTCOMES_PER_BYTE
+    padded = np.zeros((num_seasons, padded_fixtures), dtype=np.uint8)
+    padded[:, :num_fixtures] = outcomes
+    grouped = padded.reshape(num_seasons, -1, OUTCOMES_PER_BYTE)
+    return grouped[:, :, 0] | (grouped[:, :, 1] << 2) | (grouped[:, :, 2] << 4) | (grouped[:, :, 3] << 6)
+
+
+def unpack_outcomes(packed, num_fixtures):
+    """
+    Reverses pack_outcomes(), returning (seasons, num_fixtures) uint8 outcome codes.
+    """
+    shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+    unpacked = (np.asarray(packed)[:, :, None] >> shifts) & 0b11
+    return unpacked.reshape(packed.shape[0], -1)[:, :num_fixtures]
+
+
+def odds_version(league):
+    """
+    Hashes the outcome probabilities samples are drawn from. The snapshot version only
+    covers standings and fixtures, so an odds-only refresh needs its own store.
+    """
+    return hashlib.md5(np.ascontiguousarray(league["probs"]).tobytes()).hexdigest()
+
+
+def get_meta_path(version, odds):
+    """
+    Returns the metadata path of the sample store for a snapshot and odds version.
+    The metadata names the data file it describes.
+    """
+    return f"cache/samples_{version}_{odds}.json"
+
+
+def write_sample_store(league, version, num_seasons, seed=None, chunk_size=CHUNK_SIZE):
+    """
+    Simulates num_seasons seasons chunk by chunk and writes them bit-packed to disk.
+
+    Args:
+        league (dict): Arrays from build_league_arrays().
+        version (str): Snapshot version the samples belong to (the odds version comes from league).
+        num_seasons (int): Number of seasons to simulate (10M x 380 fixtures is ~1 GB).
+        seed (int): Optional seed for reproducible samples.
+        chunk_size (int): Seasons simulated and packed at a time, bounds peak memory.
+
+    Returns:
+        str: Path of the data file.
+    """
+    odds = odds_version(league)
+    meta_path = get_meta_path(version, odds)
+    # every write gets a new data file and the metadata is switched to it last, so a
+    # reader always maps the data its metadata describes, never a file replaced under it
+    data_path = f"{meta_path[:-len('.json')]}_{uuid.uuid4().hex[:8]}.bin"
+    ensure_folder_exists(data_path)
+
+    num_fixtures = len(league["match_keys"])
+    row_bytes = -(-num_fixtures // OUTCOMES_PER_BYTE)
+
+    # write to a temp file first so readers never map a half-written store
+    tmp_path = data_path + ".tmp"
+    data = np.memmap(tmp_path, dtype=np.uint8, mode="w+", shape=(num_seasons, row_bytes))
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_seasons, chunk_size):
+        stop = min(start + chunk_size, num_seasons)
+        data[start:stop] = pack_outcomes(sample_outcomes(league["probs"], stop - start, rng))
+    data.flush()
+    del data
+    os.replace(tmp_path, data_path)
+
+    previous = load_json(meta_path)["data_file"] if os.path.exists(meta_path) else None
+    save_json({
+        "version": version,
+        "odds_version": odds,
+        "data_file": data_path,
+        "num_seasons": num_seasons,
+        "num_fixtures": num_fixtures,
+        "match_keys": league["match_keys"],
+        "seed": seed
+    }, meta_path)
+
+    # readers that already mapped the old file keep their pages until they close it
+    if previous and previous != data_path and os.path.exists(previous):
+        os.remove(previous)
+
+    open_sample_store.cache_clear()
+    return data_path
+
+
+@lru_cache(maxsize=None)
+def open_sample_store(version, odds):
+    """
+    Memory-maps a sample store read-only. Worker processes opening the same store share
+    its pages through the OS page cache, so nothing is loaded into RAM up front.
+
+    Args:
+        version (str): Snapshot version.
+        odds (str): odds_version() of the league arrays the store was drawn from.
+
+    Returns:
+        dict: {"meta": metadata dict, "data": (seasons, bytes) read-only memmap}
+    """
+    meta_path = get_meta_path(version, odds)
+    if not os.path.exists(meta_path):
+        raise FileNotFoundError(f"No sample store for snapshot {version} with these odds. "
+                                "Run write_sample_store() first.")
+
+    meta = load_json(meta_path)
+    row_bytes = -(-meta["num_fixtures"] // OUTCOMES_PER_BYTE)
+    data = np.memmap(meta["data_file"], dtype=np.uint8, mode="r", shape=(meta["num_seasons"], row_bytes))
+    return {"meta": meta, "data": data}
+
+
+def iter_chunks(store, chunk_size=CHUNK_SIZE):
+    """
+    Yields the store's seasons as unpacked (chunk, fixtures) outcome arrays.
+    """
+    num_fixtures = store["meta"]["num_fixtures"]
+    for start in range(0, store["meta"]["num_seasons"], chunk_size):
+        yield unpack_outcomes(store["data"][start:start + chunk_size], num_fixtures)
+
+
+def scan_sample_store(store, league, target_team, target_rank, conditions=None, chunk_size=CHUNK_SIZE):
+    """
+    Scans the stored seasons in chunks to estimate a conditional probability and
+    each fixture's leverage on it.
+
+    Unlike run_monte_carlo's fixed outcomes, conditions filter the stored seasons
+    rather than overwrite them, so any query can reuse the same samples.
+
+    Args:
+        store (dict): Store returned by open_sample_store().
+        league (dict): Arrays from build_league_arrays() for the same snapshot.
+        target_team (str): Team the user wants to track
+        target_rank (int): Desired rank (e.g., top 4 = 4)
+        conditions (dict): Required outcomes, e.g., {"Arsenal vs Man City": "home"}
+        chunk_size (int): Seasons unpacked and scored at a time.
+
+    Returns:
+        dict: probability, matching_seasons, and per-fixture leverage
+            ({match: {"home", "draw", "away"}} probability given each result)
+    """
+    if store["meta"]["match_keys"] != league["match_keys"]:
+        raise ValueError("Sample store fixtures don't match the league snapshot.")
+    if store["meta"].get("odds_version") != odds_version(league):
+        raise ValueError("Sample store was drawn from different odds, write a new one for the current odds.")
+
+    conditions = conditions or {}
+    condition_cols = [(league["match_keys"].index(match), OUTCOMES.index(result)) for match, result in conditions.items()]
+    team_idx = league["teams"].index(target_team)
+    incidence = fixture_incidence(league)
+
+    num_fixtures = len(league["match_keys"])
+    matching = 0
+    successes = 0
+    outcome_counts = np.zeros((num_fixtures, 3), dtype=np.int64)
+    outcome_successes = np.zeros((num_fixtures, 3), dtype=np.int64)
+
+    for outcomes in iter_chunks(store, chunk_size):
+        # keep only seasons consistent with the conditions
+        mask = np.ones(outcomes.shape[0], dtype=bool)
+        for col, code in condition_cols:
+            mask &= outcomes[:, col] == code
+        outcomes = outcomes[mask]
+        if outcomes.shape[0] == 0:
+            continue
+
+        positions = rank_positions(final_points(outcomes, league, incidence), league["tiebreak_order"])
+        success = positions[:, team_idx] <= target_rank
+
+        matching += outcomes.shape[0]
+        successes += int(success.sum())
+        for code in range(3):
+            hit = outcomes == code
+            outcome_counts[:, code] += np.count_nonzero(hit, axis=0)
+            outcome_successes[:, code] += np.count_nonzero(hit[success], axis=0)
+
+    leverage = {}
+    for f, match_key in enumerate(league["match_keys"]):
+        leverage[match_key] = {
+            result: (float(outcome_successes[f, code] / outcome_counts[f, code]) if outcome_counts[f, code] else None)
+            for code, result in enumerate(OUTCOMES)
+        }
+
+    return {
+        "probability": successes / matching if matching else None,
+        "matching_seasons": matching,
+        "leverage": leverage
+    }
@@ -1,10 +1,32 @@
-import pandas as pd
-from pulp import LpProblem, LpMaximize, LpVariable, LpBinary, LpMinimize, LpConstraint, LpStatus, lpSum
+import math
+import json
+import os
+import re
+import tempfile
+import time
+import numpy as np
 from backend.gpt_interface import call_gpt, explain_solution
-from backend.data_loader import load_data
-from backend.monte_carlo import run_monte_carlo, get_cache_filename, save_sim, load_sim
+from backend.data_loader import load_snapshot, load_cached_odds, USE_DUMMY_DATA
+from backend.get_odds import find_match_probabilities
+from backend.metrics import timed, observe, record_cache
+from backend.league_config import get_league_config, DEFAULT_LEAGUE
+from backend.monte_carlo import (
+    run_monte_carlo, get_cache_filename, save_sim, load_sim, NUM_SIMULATIONS, build_league_arrays,
+    sample_outcomes, apply_fixed_outcomes, fixture_incidence, final_points, rank_positions
+)
 
 
+# solver settings
+DEFAULT_OBJECTIVE = "most_probable"  # or "feasibility" for the first witness CBC finds
+SOLVER_TIME_LIMIT = 10  # seconds per MILP solve, keeps pathological queries bounded
+SOLVER_GAP_REL = 0.001  # relative gap accepted when maximizing path probability
+MIN_PROBABILITY = 1e-6  # floor before taking logs of bookmaker probabilities
+DEFAULT_BACKEND = os.getenv("SOLVER_BACKEND", "highs")  # "highs" in-process, "cbc" via PuLP subprocess
+OUTCOME_KEYS = ['home', 'draw', 'away']
+
+# solve status: a path was found, proven impossible, or the time limit ran out before either
+FEASIBLE, INFEASIBLE, UNKNOWN = "feasible", "infeasible", "unknown"
+
 
 # helpers
 
@@ -46,76 +68,105 @@ def load_prompt_from_file(prompt_header: str, prompts_file: str = "prompts.txt")
     raise ValueError(f"Prompt with header '{prompt_header}' not found in {prompts_file} or backend/{prompts_file}.")
 
 
-def solve_scenario(user_prompt: str) -> dict:
-    # load (dummy) data
-    standings_json, fixtures_json = load_data(dummy=True)
-
-    # extract team info
-    table = standings_json["standings"][0]["table"]
-
-    # create list for standings
-    standings_list = []
-    for entry in table:
-        standings_list.append({
-            "team_id": entry["team"]["id"],
-            "team_name": entry["team"]["name"],
-            "points": entry["points"],
-            "played": entry["playedGames"],
-            "won": entry["won"],
-            "drawn": entry["draw"],
-            "lost": entry["lost"],
-            "goal_difference": entry["goalDifference"],
-            "goals_for": entry["goalsFor"],
-            "goals_against": entry["goalsAgainst"],
-            "position": entry["position"]
-        })
+def extract_outcomes(fixtures_df, choices, match_probs):
+    """
+    Turns the chosen result per fixture ({match_id: 'home'/'draw'/'away'}) into outcome dicts.
+    """
+    outcomes = []
+    for idx, row in fixtures_df.iterrows():
+        match_id = row["match_id"]
+        home = row["home_team_name"]
+        away = row["away_team_name"]
+        probs = match_probs.get(match_id, {'home': 1/3, 'draw': 1/3, 'away': 1/3})
+        choice = choices.get(match_id)
+
+        if choice == "home":
+            outcome = {"match": f"{home} vs {away}", "result": f"{home} wins", "probability": probs["home"]}
+        elif choice == "away":
+            outcome = {"match": f"{home} vs {away}", "result": f"{away} wins", "probability": probs["away"]}
+        elif choice == "draw":
+            outcome = {"match": f"{home} vs {away}", "result": "draw", "probability": probs["draw"]}
+        else:
+            outcome = {"match": f"{home} vs {away}", "result": "unknown", "probability": None}
 
-    # convert list to dataframe
-    standings_df = pd.DataFrame(standings_list)
-
-    # extract fixture info
-    fixtures = fixtures_json["matches"]
-
-    # create list for fixtures
-    fixtures_list = []
-    for fixture in fixtures:
-        fixtures_list.append({
-            "match_id": fixture["id"],
-            "matchday": fixture["matchday"],
-            "home_team_id": fixture["homeTeam"]["id"],
-            "home_team_name": fixture["homeTeam"]["name"],
-            "away_team_id": fixture["awayTeam"]["id"],
-            "away_team_name": fixture["awayTeam"]["name"],
-            "utc_date": fixture["utcDate"],
-            "status": fixture["status"]
-        })
+        # an outcome is an upset if the bookmakers had something else as favourite
+        if outcome["probability"] is not None:
+            outcome["upset"] = outcome["probability"] < max(probs.values())
+        outcomes.append(outcome)
+    return outcomes
 
-    # convert list to dataframe
-    fixtures_df = pd.DataFrame(fixtures_list)
 
-    # get simple fixture list for gpt
-    gpt_fixture_list = []
-    for idx, row in fixtures_df.iterrows():
-        gpt_fixture_list.append(f"{row['home_team_name']} vs {row['away_team_name']}")
+def fixed_choices(fixtures_df, target_team, fixed_outcomes):
+    """
+    Maps GPT fixed outcomes (win/draw/loss for target_team) onto fixtures as {match_id: 'home'/'draw'/'away'}.
+    """
+    choices = {}
+    for outcome in fixed_outcomes:
+        match_desc = outcome["match"] # e.g Man United vs Arsenal
+        result = outcome["result"] # e.g loss
 
-    # use user_prompt directly
-    scenario = call_gpt(user_prompt)
+        for idx, row in fixtures_df.iterrows():
+            home = row["home_team_name"] 
+            away = row["away_team_name"]
+            match_id = row["match_id"]
 
-    # extract scenario components safely, handling None scenario
-    if scenario is None:
-        return {"error": "Scenario could not be parsed from GPT. Please try again or check your input."}
+            if match_desc == f"{home} vs {away}" or match_desc == f"{away} vs {home}":
+                if result == "win":
+                    if home == target_team:
+                        choices[match_id] = "home"
+                    elif away == target_team:
+                        choices[match_id] = "away"
+                elif result == "loss":
+                    if home == target_team:
+                        choices[match_id] = "away"
+                    elif away == target_team:
+                        choices[match_id] = "home"
+                elif result == "draw":
+                    choices[match_id] = "draw"
+    return choices
+
+
+def outcome_log_probs(fixtures_df, match_probs):
+    """
+    Log-probability of every outcome per fixture, floored so impossible prices stay finite.
+    """
+    log_prob = {}
+    for match_id in fixtures_df["match_id"]:
+        probs = match_probs.get(match_id, {'home': 1/3, 'draw': 1/3, 'away': 1/3})
+        log_prob[match_id] = {k: math.log(max(p, MIN_PROBABILITY)) for k, p in probs.items()}
+    return log_prob
 
-    try:
-        target_team_raw = scenario["target_team"]
-        target_rank = scenario["target_rank"]
-        fixed_outcomes = scenario["fixed_outcomes"]
-    except (KeyError, TypeError):
-        return {"error": "Scenario is missing required fields: 'target_team', 'target_rank', or 'fixed_outcomes'."}
 
-    target_team = match_team_name(target_team_raw, standings_df["team_name"].tolist())
+def ranking_big_m(fixtures_df, team_points, config):
+    """
+    Smallest big-M that can never cut off a valid table: the largest final-points lead
+    any team can have over the lowest current points, plus one.
+    """
+    remaining = fixtures_df["home_team_name"].value_counts().add(
+        fixtures_df["away_team_name"].value_counts(), fill_value=0
+    )
+    max_final = max(points + config["points"]["win"] * remaining.get(team, 0) for team, points in team_points.items())
+    return max_final - min(team_points.values()) + 1
+
+
+def solve_paths_cbc(fixtures_df, team_points, target_team, target_rank, fixed_outcomes, match_probs,
+                    objective, k_best, time_limit, gap_rel, config):
+    """
+    PuLP/CBC backend for solve_paths. CBC runs as a subprocess reading and writing temp model files.
+    """
+    # imported on first use, like scipy in solve_paths_highs, to keep worker boot fast
+    from pulp import (
+        LpProblem, LpMaximize, LpVariable, LpBinary, LpMinimize, LpStatus, lpSum, PULP_CBC_CMD,
+        LpSolutionOptimal, LpSolutionIntegerFeasible
+    )
+
+    build_start = time.perf_counter()
 
     # create optimization model
-    model = LpProblem("Premier League Optimization", LpMinimize)
+    if objective == "most_probable":
+        model = LpProblem("Premier League Optimization", LpMaximize)
+    else:
+        model = LpProblem("Premier League Optimization", LpMinimize)
 
     # create variables for each match outcome
     home_win = {}
@@ -132,34 +183,13 @@ def solve_scenario(user_prompt: str) -> dict:
         model += home_win[match_id] + draw[match_id] + away_win[match_id] == 1
 
     # apply fixed outcomes from gpt scenario
-    for outcome in fixed_outcomes:
-        match_desc = outcome["match"] # e.g Man United vs Arsenal
-        result = outcome["result"] # e.g loss
-
-        for idx, row in fixtures_df.iterrows():
-            home = row["home_team_name"] 
-            away = row["away_team_name"]
-            match_id = row["match_id"]
-
-            if match_desc == f"{home} vs {away}" or match_desc == f"{away} vs {home}":
-                if result == "win":
-                    if home == target_team:
-                        model += home_win[match_id] == 1
-                    elif away == target_team:
-                        model += away_win[match_id] == 1
-                elif result == "loss":
-                    if home == target_team:
-                        model += away_win[match_id] == 1
-                    elif away == target_team:
-                        model += home_win[match_id] == 1
-                elif result == "draw":
-                    model += draw[match_id] == 1
-
-    # create current points dict
-    team_points = standings_df.set_index("team_name")["points"].to_dict()
+    outcome_vars = {"home": home_win, "draw": draw, "away": away_win}
+    for match_id, choice in fixed_choices(fixtures_df, target_team, fixed_outcomes).items():
+        model += outcome_vars[choice][match_id] == 1
 
     # create future points dict (empty at start)
     future_points = {team: 0 for team in team_points.keys()}
+    points = config["points"]
 
     # sum up future points from match outcomes
     for idx, row in fixtures_df.iterrows():
@@ -167,17 +197,19 @@ def solve_scenario(user_prompt: str) -> dict:
         home_team = row["home_team_name"]
         away_team = row["away_team_name"]
 
-        future_points[home_team] += home_win[match_id] * 3 + draw[match_id]
-        future_points[away_team] += away_win[match_id] * 3 + draw[match_id]
+        future_points[home_team] += (home_win[match_id] * points["win"] + draw[match_id] * points["draw"]
+                                     + away_win[match_id] * points["loss"])
+        future_points[away_team] += (away_win[match_id] * points["win"] + draw[match_id] * points["draw"]
+                                     + home_win[match_id] * points["loss"])
 
     # target team's total points
     target_final_points = team_points[target_team] + future_points[target_team]
 
-    # rank constraint: must finish above (20 - target_rank) teams
-    teams_to_beat = 20 - target_rank
+    # rank constraint: must finish above (num_teams - target_rank) teams
+    teams_to_beat = len(team_points) - target_rank
 
     beat_vars = []
-    big_M = 100
+    big_M = ranking_big_m(fixtures_df, team_points, config)
 
     for team in team_points:
         if team == target_team:
@@ -192,92 +224,524 @@ def solve_scenario(user_prompt: str) -> dict:
         # big-M constraint for ranking
         model += (target_final_points - team_final_points) >= 1 - big_M * (1 - b)
 
-    # require at least (20 - target_rank) teams beaten
+    # require at least (num_teams - target_rank) teams beaten
     model += lpSum(beat_vars) >= teams_to_beat
 
-    # solve model (dummy objective, feasibility only)
-    model += 0
-    status = model.solve()
+    # objective: dummy for feasibility, summed log-probability for most_probable
+    log_prob = outcome_log_probs(fixtures_df, match_probs)
 
-    # extract solution outcomes into list
-    solution_outcomes = []
-    for idx, row in fixtures_df.iterrows():
-        match_id = row["match_id"]
-        home = row["home_team_name"]
-        away = row["away_team_name"]
+    if objective == "most_probable":
+        model += lpSum(
+            log_prob[m]["home"] * home_win[m] + log_prob[m]["draw"] * draw[m] + log_prob[m]["away"] * away_win[m]
+            for m in home_win
+        )
+        # CBC reports stopping at gapRel as optimal, only its log tells the two apart
+        log_path = None
+        if gap_rel:
+            with tempfile.NamedTemporaryFile(suffix=".log", delete=False) as log_file:
+                log_path = log_file.name
+        solver = PULP_CBC_CMD(msg=False, timeLimit=time_limit, gapRel=gap_rel, logPath=log_path)
+    else:
+        model += 0
+        log_path = None
+        solver = PULP_CBC_CMD(msg=False, timeLimit=time_limit)
+    observe("milp_build", time.perf_counter() - build_start, backend="cbc")
 
-        if home_win[match_id].varValue == 1:
-            outcome = {"match": f"{home} vs {away}", "result": f"{home} wins"}
-        elif away_win[match_id].varValue == 1:
-            outcome = {"match": f"{home} vs {away}", "result": f"{away} wins"}
-        elif draw[match_id].varValue == 1:
-            outcome = {"match": f"{home} vs {away}", "result": "draw"}
-        else:
-            outcome = {"match": f"{home} vs {away}", "result": "unknown"}
-        solution_outcomes.append(outcome)
+    status = INFEASIBLE
+    paths = []
+    try:
+        for k in range(k_best):
+            with timed("milp_solve", backend="cbc"):
+                model.solve(solver)
+            if model.sol_status not in (LpSolutionOptimal, LpSolutionIntegerFeasible):
+                # "Not Solved" means CBC hit the time limit before finding any solution
+                if k == 0 and LpStatus[model.status] != "Infeasible":
+                    status = UNKNOWN
+                break
+            status = FEASIBLE
+
+            chosen = []
+            choices = {}
+            for m in home_win:
+                for key, var in outcome_vars.items():
+                    if var[m].varValue is not None and var[m].varValue > 0.5:
+                        chosen.append(var[m])
+                        choices[m] = key
+
+            # same labels as highs_optimality, so both backends agree on identical solves
+            if model.sol_status == LpSolutionIntegerFeasible:
+                optimality = "time_limit"
+            elif log_path and cbc_gap(log_path) > 1e-9:
+                optimality = "within_gap"
+            else:
+                optimality = "optimal"
+
+            paths.append({
+                "outcomes": extract_outcomes(fixtures_df, choices, match_probs),
+                "log_probability": sum(log_prob[m][key] for m, key in choices.items()),
+                "optimality": optimality
+            })
+
+            # no-good cut so the next solve returns a different path
+            model += lpSum(chosen) <= len(chosen) - 1, f"exclude_path_{k}"
+    finally:
+        if log_path:
+            os.remove(log_path)
+
+    return status, paths
+
+
+def cbc_gap(log_path):
+    """
+    Returns the absolute gap CBC stopped at according to its log, or 0.0 if it
+    searched to a proven optimum.
+    """
+    with open(log_path, "r") as f:
+        match = re.search(r"Exiting as integer gap of ([-+0-9.eE]+)", f.read())
+    return float(match.group(1)) if match else 0.0
 
-    # Check feasibility using LP model
-    if LpStatus[model.status] == "Optimal":
-        feasible = True
-        # Convert fixed_outcomes to Monte Carlo format (if needed)
-        fixed_outcomes_mc = {}
-        for outcome in fixed_outcomes:
-            match = outcome["match"]
-            result = outcome["result"]
-            home, away = match.split(" vs ")
-            if result == "win":
-                if target_team == home:
-                    fixed_outcomes_mc[match] = "home"
-                else:
-                    fixed_outcomes_mc[match] = "away"
-            elif result == "loss":
-                if target_team == home:
-                    fixed_outcomes_mc[match] = "away"
-                else:
-                    fixed_outcomes_mc[match] = "home"
-            elif result == "draw":
-                fixed_outcomes_mc[match] = "draw"
 
-        cache_filename = get_cache_filename(target_team, target_rank, fixed_outcomes_mc)
-        cached_result = load_sim(cache_filename)
-        if cached_result is not None:
-            probability, odds_data = cached_result
-        else:
-            probability, odds_data = run_monte_carlo(target_team, target_rank, fixed_outcomes_mc, standings_df, fixtures_df)
-            save_sim((probability, odds_data), cache_filename)
-        explanation = explain_solution(
-            target_team=target_team,
-            target_rank=target_rank,
-            solution_outcomes=solution_outcomes,
-            fixed_outcomes=fixed_outcomes,
-            feasible=True,
-            probability=probability,
-            odds_data=odds_data
+def solve_paths_highs(fixtures_df, team_points, target_team, target_rank, fixed_outcomes, match_probs,
+                      objective, k_best, time_limit, gap_rel, config):
+    """
+    In-process HiGHS backend for solve_paths. Builds the same model as solve_paths_cbc
+    directly as sparse matrices for scipy.optimize.milp, so no subprocess or temp files.
+    """
+    # scipy.optimize alone adds ~0.5s to a cold import, so load it on first solve (or prewarm)
+    from scipy import sparse
+    from scipy.optimize import milp, LinearConstraint, Bounds
+
+    build_start = time.perf_counter()
+
+    teams = list(team_points.keys())
+    team_index = {team: i for i, team in enumerate(teams)}
+    others = [team for team in teams if team != target_team]
+    match_ids = fixtures_df["match_id"].tolist()
+    num_fixtures = len(match_ids)
+
+    # variables: [home_win, draw, away_win] per fixture, then one beat var per other team
+    num_outcome_vars = 3 * num_fixtures
+    num_vars = num_outcome_vars + len(others)
+
+    # future points per team as a (teams, outcome vars) matrix
+    home_idx = np.array([team_index[t] for t in fixtures_df["home_team_name"]], dtype=np.int64)
+    away_idx = np.array([team_index[t] for t in fixtures_df["away_team_name"]], dtype=np.int64)
+    cols = np.arange(num_fixtures) * 3
+    home_points = [config["points"][key] for key in ("win", "draw", "loss")]
+    away_points = home_points[::-1]
+    points_matrix = sparse.coo_matrix(
+        (
+            np.concatenate([np.full(num_fixtures, float(p)) for p in home_points + away_points]),
+            (
+                np.concatenate([home_idx] * 3 + [away_idx] * 3),
+                np.concatenate([cols, cols + 1, cols + 2] * 2)
+            )
+        ),
+        shape=(len(teams), num_outcome_vars)
+    ).tocsr()
+
+    # one outcome per match
+    one_outcome = sparse.hstack([
+        sparse.kron(sparse.identity(num_fixtures), np.ones((1, 3))),
+        sparse.csr_matrix((num_fixtures, len(others)))
+    ])
+    constraints = [LinearConstraint(one_outcome, 1, 1)]
+
+    # rank constraint: must finish above (num_teams - target_rank) teams
+    teams_to_beat = len(teams) - target_rank
+    big_M = ranking_big_m(fixtures_df, team_points, config)
+
+    # big-M constraint for ranking: (target - team) - M * b >= 1 - M - (current gap)
+    target_row = points_matrix[team_index[target_team]]
+    other_rows = points_matrix[[team_index[t] for t in others]]
+    beat_block = sparse.hstack([
+        sparse.vstack([target_row] * len(others)) - other_rows,
+        -big_M * sparse.identity(len(others))
+    ])
+    current_gap = np.array([team_points[target_team] - team_points[t] for t in others], dtype=np.float64)
+    constraints.append(LinearConstraint(beat_block, 1 - big_M - current_gap, np.inf))
+
+    # require at least (num_teams - target_rank) teams beaten
+    beat_sum = sparse.hstack([sparse.csr_matrix((1, num_outcome_vars)), np.ones((1, len(others)))])
+    constraints.append(LinearConstraint(beat_sum, teams_to_beat, np.inf))
+
+    # apply fixed outcomes from gpt scenario as bounds
+    lower = np.zeros(num_vars)
+    position = {match_id: i for i, match_id in enumerate(match_ids)}
+    for match_id, choice in fixed_choices(fixtures_df, target_team, fixed_outcomes).items():
+        lower[3 * position[match_id] + OUTCOME_KEYS.index(choice)] = 1
+    bounds = Bounds(lower, np.ones(num_vars))
+
+    # objective: dummy for feasibility, minus summed log-probability for most_probable
+    log_prob = outcome_log_probs(fixtures_df, match_probs)
+    c = np.zeros(num_vars)
+    options = {"disp": False}
+    if time_limit is not None:
+        options["time_limit"] = time_limit
+    if objective == "most_probable":
+        c[:num_outcome_vars] = [-log_prob[m][key] for m in match_ids for key in OUTCOME_KEYS]
+        if gap_rel is not None:
+            options["mip_rel_gap"] = gap_rel
+    observe("milp_build", time.perf_counter() - build_start, backend="highs")
+
+    status = INFEASIBLE
+    paths = []
+    for k in range(k_best):
+        with timed("milp_solve", backend="highs"):
+            res = milp(c, constraints=constraints, integrality=np.ones(num_vars), bounds=bounds, options=options)
+        # res.status: 0 optimal (within mip_rel_gap), 1 time/iteration limit, 2 infeasible
+        if res.status not in (0, 1, 2):
+            raise RuntimeError(f"HiGHS failed: {res.message}")
+        if res.x is None:
+            if k == 0 and res.status == 1:
+                status = UNKNOWN
+            break
+        status = FEASIBLE
+
+        chosen = np.flatnonzero(res.x[:num_outcome_vars] > 0.5)
+        choices = {match_ids[i // 3]: OUTCOME_KEYS[i % 3] for i in chosen}
+        paths.append({
+            "outcomes": extract_outcomes(fixtures_df, choices, match_probs),
+            "log_probability": sum(log_prob[m][key] for m, key in choices.items()),
+            "optimality": highs_optimality(res)
+        })
+
+        # no-good cut so the next solve returns a different path
+        cut = np.zeros((1, num_vars))
+        cut[0, chosen] = 1
+        constraints.append(LinearConstraint(cut, -np.inf, len(chosen) - 1))
+
+    return status, paths
+
+
+def highs_optimality(res):
+    """
+    Classifies a HiGHS solution: "time_limit" for an incumbent cut off by the limit,
+    "within_gap" if it stopped at mip_rel_gap, else "optimal".
+    """
+    if res.status == 1:
+        return "time_limit"
+    if getattr(res, "mip_gap", 0) and res.mip_gap > 1e-9:
+        return "within_gap"
+    return "optimal"
+
+
+# pluggable MILP backends, selected per call or with the SOLVER_BACKEND env var
+SOLVER_BACKENDS = {
+    "cbc": solve_paths_cbc,
+    "highs": solve_paths_highs
+}
+
+
+def solve_paths(fixtures_df, team_points, target_team, target_rank, fixed_outcomes, match_probs,
+                objective=DEFAULT_OBJECTIVE, k_best=1, time_limit=SOLVER_TIME_LIMIT, gap_rel=SOLVER_GAP_REL,
+                backend=DEFAULT_BACKEND, league=DEFAULT_LEAGUE):
+    """
+    Builds and solves the feasibility MILP, returning up to k_best scenario paths.
+
+    Args:
+        fixtures_df (DataFrame): Remaining fixtures.
+        team_points (dict): Current points per team name.
+        target_team (str): Team the user cares about.
+        target_rank (int): Desired final league position.
+        fixed_outcomes (list): GPT fixed outcomes (win/draw/loss from target_team's view).
+        match_probs (dict): {match_id: {'home', 'draw', 'away'}} outcome probabilities.
+        objective (str): "feasibility" for any witness, "most_probable" to maximize
+            the summed log-probability of the chosen outcomes.
+        k_best (int): Number of distinct paths to enumerate (most probable first).
+        time_limit (float): Solver time limit in seconds per solve (None for no limit).
+        gap_rel (float): Relative MIP gap accepted for most_probable solves.
+        backend (str): Key into SOLVER_BACKENDS, "highs" (in-process) or "cbc" (subprocess).
+        league (str or dict): League code or config, for points rules.
+
+    Returns:
+        tuple: (status, paths). status is FEASIBLE, INFEASIBLE, or UNKNOWN when the time
+            limit ran out before a path was found or infeasibility was proven. Each path is
+            {"outcomes": [...], "log_probability": float, "optimality": str}, where optimality
+            is "optimal", "within_gap" (stopped at gap_rel) or "time_limit" (best found in time).
+    """
+    if objective not in ("feasibility", "most_probable"):
+        raise ValueError(f"Unknown objective '{objective}'. Use 'feasibility' or 'most_probable'.")
+    if backend not in SOLVER_BACKENDS:
+        raise ValueError(f"Unknown solver backend '{backend}'. Use one of {list(SOLVER_BACKENDS)}.")
+
+    return SOLVER_BACKENDS[backend](
+        fixtures_df, team_points, target_team, target_rank, fixed_outcomes, match_probs,
+        objective, k_best, time_limit, gap_rel, get_league_config(league)
+    )
+
+
+def compare_backends(fixtures_df, team_points, target_team, target_rank, fixed_outcomes, match_probs,
+                     objective=DEFAULT_OBJECTIVE, k_best=1, time_limit=SOLVER_TIME_LIMIT, gap_rel=SOLVER_GAP_REL,
+                     league=DEFAULT_LEAGUE):
+    """
+    Solves the same scenario with every backend and reports wall-clock time per backend.
+
+    Returns:
+        dict: {backend: {"seconds", "status", "log_probabilities"}}
+    """
+    timings = {}
+    for backend in SOLVER_BACKENDS:
+        start = time.perf_counter()
+        status, paths = solve_paths(
+            fixtures_df, team_points, target_team, target_rank, fixed_outcomes, match_probs,
+            objective=objective, k_best=k_best, time_limit=time_limit, gap_rel=gap_rel, backend=backend, league=league
         )
+        timings[backend] = {
+            "seconds": time.perf_counter() - start,
+            "status": status,
+            "log_probabilities": [path["log_probability"] for path in paths]
+        }
+    return timings
+
+
+def parse_scenario(scenario, team_list, league=DEFAULT_LEAGUE):
+    """
+    Turns a natural-language prompt (via GPT) or an already structured scenario into
+    (target_team, target_rank, fixed_outcomes).
+
+    Raises:
+        ValueError: If the scenario can't be parsed, is malformed or names an unknown team.
+    """
+    if isinstance(scenario, str):
+        # use user_prompt directly
+        scenario = call_gpt(scenario, league=league)
+
+    # extract scenario components safely, handling None scenario
+    if scenario is None:
+        raise ValueError("Scenario could not be parsed from GPT. Please try again or check your input.")
+
+    try:
+        target_team_raw = scenario["target_team"]
+        target_rank = scenario["target_rank"]
+        fixed_outcomes = scenario.get("fixed_outcomes") or []
+    except (KeyError, TypeError, AttributeError):
+        raise ValueError("Scenario is missing required fields: 'target_team', 'target_rank', or 'fixed_outcomes'.")
+
+    # structured scenarios come straight from API callers, so check types before anything indexes them
+    if not isinstance(target_team_raw, str):
+        raise ValueError("'target_team' must be a team name.")
+    if not isinstance(target_rank, int) or isinstance(target_rank, bool) or not 1 <= target_rank <= len(team_list):
+        raise ValueError(f"'target_rank' must be a whole number from 1 to {len(team_list)}.")
+    if not isinstance(fixed_outcomes, list):
+        raise ValueError("'fixed_outcomes' must be a list of {'match', 'result'} objects.")
+    for outcome in fixed_outcomes:
+        if not isinstance(outcome, dict) or not isinstance(outcome.get("match"), str):
+            raise ValueError("Each fixed outcome needs a 'match' like 'Home Team vs Away Team'.")
+        if len(outcome["match"].split(" vs ")) != 2:
+            raise ValueError(f"Fixed outcome match '{outcome['match']}' should look like 'Home Team vs Away Team'.")
+        if outcome.get("result") not in ("win", "draw", "loss"):
+            raise ValueError(f"Fixed outcome for '{outcome['match']}' needs a 'result' of win, draw or loss.")
+
+    target_team = match_team_name(target_team_raw, team_list)
+    return target_team, target_rank, fixed_outcomes
+
+
+def to_monte_carlo_outcomes(fixed_outcomes, target_team):
+    """
+    Converts fixed_outcomes (win/draw/loss for target_team) to Monte Carlo format ({match: home/draw/away}).
+    """
+    fixed_outcomes_mc = {}
+    for outcome in fixed_outcomes:
+        match = outcome["match"]
+        result = outcome["result"]
+        home, away = match.split(" vs ")
+        if result == "win":
+            if target_team == home:
+                fixed_outcomes_mc[match] = "home"
+            else:
+                fixed_outcomes_mc[match] = "away"
+        elif result == "loss":
+            if target_team == home:
+                fixed_outcomes_mc[match] = "away"
+            else:
+                fixed_outcomes_mc[match] = "home"
+        elif result == "draw":
+            fixed_outcomes_mc[match] = "draw"
+    return fixed_outcomes_mc
+
+
+def build_result(target_team, target_rank, fixed_outcomes, status, paths, objective, probability, odds_data, explain=True):
+    """
+    Assembles the response dict shared by solve_scenario and solve_batch.
+    "feasible" is None when the solver ran out of time without an answer.
+    """
+    feasible = {FEASIBLE: True, INFEASIBLE: False}.get(status)
+
+    # extract solution outcomes into list
+    solution_outcomes = paths[0]["outcomes"] if paths else []
+
+    # the most probable path only needs the upsets explaining, the rest are favourites winning
+    if objective == "most_probable":
+        explained_outcomes = [o for o in solution_outcomes if o.get("upset")]
     else:
-        feasible = False
-        probability = 0.0
-        odds_data = None
+        explained_outcomes = solution_outcomes
+
+    explanation = None
+    if explain and status == UNKNOWN:
+        # don't let GPT call an unanswered question impossible
+        explanation = (f"The solver ran out of time before deciding whether {target_team} can finish "
+                       f"in the top {target_rank}. Try again, or allow a longer time limit.")
+    elif explain:
         explanation = explain_solution(
             target_team=target_team,
             target_rank=target_rank,
-            solution_outcomes=solution_outcomes,
+            solution_outcomes=explained_outcomes,
             fixed_outcomes=fixed_outcomes,
-            feasible=False,
-            probability=0.0,
-            odds_data=None
+            feasible=feasible,
+            probability=probability,
+            odds_data=odds_data,
+            objective=objective
         )
+
     return {
         "feasible": feasible,
+        "status": status,
         "probability": probability,
         "explanation": explanation,
         "target_team": target_team,
         "target_rank": target_rank,
         "solution_outcomes": solution_outcomes,
+        "noteworthy_outcomes": explained_outcomes,
+        "paths": paths,
         "fixed_outcomes": fixed_outcomes,
         "odds_data": odds_data
     }
 
+
+def solve_scenario(user_prompt: str, objective: str = DEFAULT_OBJECTIVE, k_best: int = 1,
+                   time_limit: float = SOLVER_TIME_LIMIT, gap_rel: float = SOLVER_GAP_REL,
+                   backend: str = DEFAULT_BACKEND, league: str = DEFAULT_LEAGUE, dummy: bool = USE_DUMMY_DATA) -> dict:
+    # load dummy or fetched data, per the DUMMY_DATA setting unless overridden
+    standings_df, fixtures_df, snapshot = load_snapshot(dummy=dummy, league=league)
+
+    try:
+        target_team, target_rank, fixed_outcomes = parse_scenario(user_prompt, standings_df["team_name"].tolist(), league)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    # create current points dict
+    team_points = standings_df.set_index("team_name")["points"].to_dict()
+
+    # outcome probabilities for every fixture from the cached odds
+    odds_cache = load_cached_odds(league)
+    match_probs = {
+        row["match_id"]: find_match_probabilities(odds_cache, row["home_team_name"], row["away_team_name"])
+        for idx, row in fixtures_df.iterrows()
+    }
+
+    status, paths = solve_paths(
+        fixtures_df, team_points, target_team, target_rank, fixed_outcomes, match_probs,
+        objective=objective, k_best=k_best, time_limit=time_limit, gap_rel=gap_rel, backend=backend, league=league
+    )
+
+    # Check feasibility using LP model
+    if status == FEASIBLE:
+        fixed_outcomes_mc = to_monte_carlo_outcomes(fixed_outcomes, target_team)
+
+        cache_filename = get_cache_filename(target_team, target_rank, fixed_outcomes_mc, snapshot, odds_cache, league)
+        cached_result = load_sim(cache_filename)
+        record_cache("monte_carlo", hit=cached_result is not None)
+        if cached_result is not None:
+            probability, odds_data = cached_result
+        else:
+            probability, odds_data = run_monte_carlo(target_team, target_rank, fixed_outcomes_mc, standings_df, fixtures_df,
+                                                     league=league, odds_data=odds_cache)
+            save_sim((probability, odds_data), cache_filename)
+    else:
+        # no probability when the solver couldn't decide either way
+        probability = 0.0 if status == INFEASIBLE else None
+        odds_data = None
+
+    return build_result(target_team, target_rank, fixed_outcomes, status, paths, objective, probability, odds_data)
+
+
+def solve_batch(scenarios: list, explain: bool = True, objective: str = DEFAULT_OBJECTIVE, k_best: int = 1,
+                time_limit: float = SOLVER_TIME_LIMIT, gap_rel: float = SOLVER_GAP_REL,
+                backend: str = DEFAULT_BACKEND, num_simulations: int = NUM_SIMULATIONS, seed: int = None,
+                league: str = DEFAULT_LEAGUE, dummy: bool = USE_DUMMY_DATA) -> list:
+    """
+    Evaluates many scenarios against one shared snapshot, the cached odds and one sample batch.
+
+    Scenarios with the same fixed outcomes are grouped, so each group costs one pass
+    over the shared samples; every scenario in the group is then just a column lookup.
+
+    Args:
+        scenarios (list): Natural-language prompts and/or dicts with target_team,
+            target_rank and fixed_outcomes (win/draw/loss from target_team's view).
+        explain (bool): Whether to call explain_solution for each scenario.
+        num_simulations (int): Size of the shared sample batch.
+        seed (int): Optional seed for reproducible samples.
+        league (str or dict): League code or config, see backend.league_config.
+        dummy (bool): Use the bundled dummy data rather than fetched data (DUMMY_DATA setting).
+
+    Returns:
+        list: One solve_scenario-style result (or {"error": ...}) per scenario, in input order.
+    """
+    standings_df, fixtures_df, snapshot = load_snapshot(dummy=dummy, league=league)
+    team_list = standings_df["team_name"].tolist()
+    team_points = standings_df.set_index("team_name")["points"].to_dict()
+
+    # cached odds, as in solve_scenario; backend.refresh keeps them current
+    odds_data = load_cached_odds(league)
+    match_probs = {
+        row["match_id"]: find_match_probabilities(odds_data, row["home_team_name"], row["away_team_name"])
+        for idx, row in fixtures_df.iterrows()
+    }
+
+    # parse everything first, then group by fixed-outcome set
+    results = [None] * len(scenarios)
+    groups = {}
+    for i, scenario in enumerate(scenarios):
+        try:
+            target_team, target_rank, fixed_outcomes = parse_scenario(scenario, team_list, league)
+            fixed_outcomes_mc = to_monte_carlo_outcomes(fixed_outcomes, target_team)
+        except ValueError as e:
+            results[i] = {"error": str(e)}
+            continue
+        except Exception as e:
+            # e.g. an OpenAI or network error parsing one prompt, the rest of the batch still runs
+            results[i] = {"error": f"Scenario could not be parsed: {e}"}
+            continue
+        group_key = json.dumps(fixed_outcomes_mc, sort_keys=True)
+        groups.setdefault(group_key, []).append((i, target_team, target_rank, fixed_outcomes, fixed_outcomes_mc))
+
+    # one sample batch shared by every group
+    with timed("simulation", engine="batch"):
+        league_arrays = build_league_arrays(standings_df, fixtures_df, odds_data, league)
+        rng = np.random.default_rng(seed)
+        base_outcomes = sample_outcomes(league_arrays["probs"], num_simulations, rng)
+        incidence = fixture_incidence(league_arrays)
+
+    for members in groups.values():
+        with timed("simulation", engine="batch"):
+            outcomes = apply_fixed_outcomes(base_outcomes.copy(), league_arrays["match_keys"], members[0][4])
+            positions = rank_positions(final_points(outcomes, league_arrays, incidence), league_arrays["tiebreak_order"])
+
+        for i, target_team, target_rank, fixed_outcomes, fixed_outcomes_mc in members:
+            # one failing solve or explanation only fails its own scenario, not the whole batch
+            try:
+                status, paths = solve_paths(
+                    fixtures_df, team_points, target_team, target_rank, fixed_outcomes, match_probs,
+                    objective=objective, k_best=k_best, time_limit=time_limit, gap_rel=gap_rel, backend=backend,
+                    league=league
+                )
+                if status == FEASIBLE:
+                    team_idx = league_arrays["teams"].index(target_team)
+                    probability = float(np.mean(positions[:, team_idx] <= target_rank))
+                else:
+                    probability = 0.0 if status == INFEASIBLE else None
+
+                results[i] = build_result(
+                    target_team, target_rank, fixed_outcomes, status, paths, objective,
+                    probability, odds_data if status == FEASIBLE else None, explain=explain
+                )
+            except Exception as e:
+                results[i] = {"error": f"Scenario could not be solved: {e}"}
+
+    return results
+
+
 # Optional: keep CLI for testing
 if __name__ == "__main__":
     # For testing, you can set a test prompt here
@@ -0,0 +1,106 @@
+"""
+Cold-start benchmark: runs each measurement in a fresh interpreter and reports
+the app import time, time until the worker accepts requests, and the latency of
+its first request, with and without the boot-time prewarm.
+
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --runs 5
+
+OpenAI and OddsAPI calls are stubbed as in run_benchmarks, so this runs offline.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(prewarm):
+    """
+    Runs inside a fresh interpreter: imports the app, starts it (running the lifespan),
+    optionally waits for the prewarm, then times the first request.
+    """
+    start = time.perf_counter()
+    from backend.api.routes import app
+    import_seconds = time.perf_counter() - start
+
+    from fastapi.testclient import TestClient
+    from backend.data_loader import load_data, load_cached_odds
+    from backend.prewarm import prewarmed
+    from benchmarks.run_benchmarks import stub_external_calls
+
+    odds_data = load_cached_odds()
+    stub_external_calls(None, odds_data)
+
+    with TestClient(app) as client:
+        ready_seconds = time.perf_counter() - start
+        prewarm_seconds = None
+        if prewarm:
+            prewarmed.wait()
+            prewarm_seconds = time.perf_counter() - start
+
+        # raw JSON rather than load_snapshot(), which would warm the snapshot cache for the request
+        standings_json, _ = load_data()
+        target_team = standings_json["standings"][0]["table"][0]["team"]["name"]
+        scenario = {"target_team": target_team, "target_rank": 4, "fixed_outcomes": []}
+        request_start = time.perf_counter()
+        response = client.post("/simulate/batch/", json={"scenarios": [scenario], "explain": False})
+        first_request_seconds = time.perf_counter() - request_start
+        response.raise_for_status()
+
+        request_start = time.perf_counter()
+        client.post("/simulate/batch/", json={"scenarios": [scenario], "explain": False})
+        second_request_seconds = time.perf_counter() - request_start
+
+    print(json.dumps({
+        "import": import_seconds,
+        "ready": ready_seconds,
+        "prewarmed": prewarm_seconds,
+        "first_request": first_request_seconds,
+        "second_request": second_request_seconds
+    }))
+
+
+def run(prewarm, runs):
+    """
+    Runs child() in `runs` fresh interpreters and returns the median of each timing.
+    """
+    env = {**os.environ, "PREWARM": "1" if prewarm else "0", "PYTHONPATH": ROOT}
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.cold_start", "--child"],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return {
+        key: statistics.median(sample[key] for sample in samples) if samples[0][key] is not None else None
+        for key in samples[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per mode")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(os.getenv("PREWARM", "1") != "0")
+        return 0
+
+    print(f"{'mode':<12} {'import ms':>10} {'ready ms':>10} {'warm ms':>10} {'1st req ms':>11} {'2nd req ms':>11}")
+    for mode, prewarm in (("no prewarm", False), ("prewarm", True)):
+        stats = run(prewarm, args.runs)
+        warm = f"{stats['prewarmed'] * 1000:>10.0f}" if stats["prewarmed"] is not None else f"{'-':>10}"
+        print(f"{mode:<12} {stats['import'] * 1000:>10.0f} {stats['ready'] * 1000:>10.0f} {warm} "
+              f"{stats['first_request'] * 1000:>11.0f} {stats['second_request'] * 1000:>11.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
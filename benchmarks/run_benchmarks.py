@@ -0,0 +1,272 @@
+"""
+Offline benchmark suite for the solver, simulator and data loading.
+
+Runs against the bundled data/*.json and cached_odds.json plus synthetic leagues,
+with the OpenAI and OddsAPI calls stubbed out, and compares median latencies
+against benchmarks/baseline.json.
+
+    python -m benchmarks.run_benchmarks                    # compare against baseline
+    python -m benchmarks.run_benchmarks --update-baseline  # record a new baseline
+    python -m benchmarks.run_benchmarks --record-missing   # add only cases the baseline lacks
+
+The baseline records its mode (full or --quick), and a run is only compared
+against a baseline of the same mode, case by case with the same number of runs.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import numpy as np
+
+import backend.solver as solver
+import backend.monte_carlo as monte_carlo
+import backend.data_loader as data_loader
+from backend.data_loader import load_data, load_snapshot, build_frames, load_cached_odds
+from backend.get_odds import find_match_probabilities
+from backend.metrics import start_request_timing
+from benchmarks.synthetic import synthetic_league
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.25  # fail if a median is more than 25% slower than baseline
+DEFAULT_MIN_DELTA_MS = 2.0  # ...and slower by at least this much, so sub-ms timer noise can't fail a run
+SYNTHETIC_SIZES = (20, 24, 48)
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return {
+        "p50": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "mean": statistics.fmean(ordered),
+        "runs": len(ordered)
+    }
+
+
+def bench(fn, repeat):
+    """
+    Times fn() repeat times and returns latency percentiles in seconds.
+    """
+    fn()  # warm-up, not recorded
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def bench_stages(fn, repeat):
+    """
+    Runs fn() repeat times and returns percentiles per instrumented stage (see backend.metrics).
+    """
+    fn()
+    stages = {}
+    for _ in range(repeat):
+        timings = start_request_timing()
+        fn()
+        per_run = {}
+        for stage, seconds in timings:
+            per_run[stage] = per_run.get(stage, 0.0) + seconds
+        for stage, seconds in per_run.items():
+            stages.setdefault(stage, []).append(seconds)
+    return {stage: percentiles(samples) for stage, samples in stages.items()}
+
+
+def stub_external_calls(scenario, odds_data):
+    """
+    Replaces every network call (OpenAI parsing/explanations, OddsAPI) with offline stand-ins.
+    """
+    solver.call_gpt = lambda prompt, **kwargs: scenario
+    solver.explain_solution = lambda **kwargs: "benchmark explanation"
+    # the solver reads cached odds, serve this league's instead of data/cached_odds.json
+    solver.load_cached_odds = lambda league=None: odds_data
+    monte_carlo.get_odds = lambda **kwargs: odds_data
+    # keep the pickle cache out of the measurements and the working tree
+    solver.load_sim = lambda filename: None
+    solver.save_sim = lambda data, filename: None
+
+
+def bench_league(name, standings_df, fixtures_df, odds_data, quick):
+    repeat = 3 if quick else 10
+    results = {}
+    teams = standings_df["team_name"].tolist()
+    # synthetic sizes reuse the default league's rules with their own team count
+    config = {"num_teams": len(teams)}
+    target_team = teams[len(teams) // 2]
+    target_rank = max(1, len(teams) // 4)
+
+    # dict-based simulator: one apply_simulation call per season
+    base_table, fixtures = monte_carlo.load_current_state(standings_df, fixtures_df)
+    simulated = {f"{home} vs {away}": "home" for home, away in fixtures}
+    stats = bench(lambda: [monte_carlo.apply_simulation(base_table, simulated, {}, config) for _ in range(100)], repeat)
+    stats["seasons_per_second"] = 100 / stats["p50"]
+    results["apply_simulation_x100"] = stats
+
+    num_loop = 200 if quick else 1000
+    stats = bench(lambda: monte_carlo.run_monte_carlo(target_team, target_rank, {}, standings_df, fixtures_df,
+                                                  num_simulations=num_loop, league=config), repeat)
+    stats["seasons_per_second"] = num_loop / stats["p50"]
+    results[f"run_monte_carlo_{num_loop}"] = stats
+
+    # vectorized engine
+    league = monte_carlo.build_league_arrays(standings_df, fixtures_df, odds_data, config)
+    rng = np.random.default_rng(0)
+    num_vec = 10000
+
+    def vectorized():
+        outcomes = monte_carlo.sample_outcomes(league["probs"], num_vec, rng)
+        monte_carlo.rank_positions(monte_carlo.final_points(outcomes, league), league["tiebreak_order"])
+
+    stats = bench(vectorized, repeat)
+    stats["seasons_per_second"] = num_vec / stats["p50"]
+    results[f"vectorized_{num_vec}"] = stats
+
+    # MILP model construction and solve, per backend
+    team_points = standings_df.set_index("team_name")["points"].to_dict()
+    match_probs = {
+        row["match_id"]: find_match_probabilities(odds_data, row["home_team_name"], row["away_team_name"])
+        for _, row in fixtures_df.iterrows()
+    }
+    for backend in solver.SOLVER_BACKENDS:
+        for stage, stats in bench_stages(lambda: solver.solve_paths(
+            fixtures_df, team_points, target_team, target_rank, [], match_probs, backend=backend, league=config
+        ), repeat).items():
+            results[f"solve_paths_{backend}/{stage}"] = stats
+
+    # end-to-end batch of every team x a few target ranks
+    scenarios = [{"target_team": team, "target_rank": rank, "fixed_outcomes": []} for team in teams for rank in (1, 4)]
+    original_load_snapshot = solver.load_snapshot
+    solver.load_snapshot = lambda dummy=True, league=None: (standings_df, fixtures_df, name)
+    try:
+        stats = bench(lambda: solver.solve_batch(scenarios, explain=False, seed=0, league=config), max(1, repeat // 3))
+    finally:
+        solver.load_snapshot = original_load_snapshot
+    stats["scenarios_per_second"] = len(scenarios) / stats["p50"]
+    results[f"solve_batch_{len(scenarios)}"] = stats
+
+    return results
+
+
+def run_all(quick=False):
+    results = {}
+    repeat = 5 if quick else 20
+
+    # data loading on the bundled files
+    results["data/load_data_real"] = bench(lambda: load_data(dummy=False), repeat)
+    # clear the in-process snapshot cache so these measure parsing, as a cold worker would
+    results["data/load_snapshot_real"] = bench(lambda: (data_loader._snapshot_cache.clear(), load_snapshot(dummy=False)), repeat)
+    results["data/load_snapshot_dummy"] = bench(lambda: (data_loader._snapshot_cache.clear(), load_snapshot(dummy=True)), repeat)
+    results["data/load_snapshot_real_cached"] = bench(lambda: load_snapshot(dummy=False), repeat)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_file = os.path.join(tmp_dir, "snapshot.npz")
+        data_loader.write_binary_snapshot(*load_data(dummy=False), snapshot_file)
+        results["data/load_binary_snapshot_real"] = bench(lambda: data_loader.load_binary_snapshot(snapshot_file), repeat)
+
+    leagues = {}
+    cached_odds = load_cached_odds()
+    for dummy, name in ((True, "bundled_dummy"), (False, "bundled_full_season")):
+        standings_df, fixtures_df, _ = load_snapshot(dummy=dummy)
+        leagues[name] = (standings_df, fixtures_df, cached_odds)
+    for size in SYNTHETIC_SIZES:
+        standings_json, fixtures_json, odds_data = synthetic_league(size)
+        standings_df, fixtures_df = build_frames(standings_json, fixtures_json)
+        leagues[f"synthetic_{size}"] = (standings_df, fixtures_df, odds_data)
+
+    for name, (standings_df, fixtures_df, odds_data) in leagues.items():
+        teams = standings_df["team_name"].tolist()
+        stub_external_calls({"target_team": teams[0], "target_rank": 1, "fixed_outcomes": []}, odds_data)
+        print(f"benchmarking {name} ({len(teams)} teams, {len(fixtures_df)} fixtures)", file=sys.stderr)
+        for case, stats in bench_league(name, standings_df, fixtures_df, odds_data, quick).items():
+            results[f"{name}/{case}"] = stats
+
+    return results
+
+
+def compare(results, baseline, tolerance, min_delta=DEFAULT_MIN_DELTA_MS / 1000):
+    """
+    Compares each case's p50 against the baseline.
+
+    Returns:
+        tuple: (regressions, unchecked). regressions lists (case, baseline p50, current p50)
+            for cases slower than baseline * (1 + tolerance) and by more than min_delta
+            seconds; unchecked lists (case, reason) for cases that couldn't be compared.
+    """
+    regressions = []
+    unchecked = []
+    for case, stats in results.items():
+        before = baseline.get(case)
+        if before is None:
+            unchecked.append((case, "no baseline"))
+        elif before["runs"] != stats["runs"]:
+            unchecked.append((case, f"baseline has {before['runs']} runs, this run {stats['runs']}"))
+        elif stats["p50"] > before["p50"] * (1 + tolerance) and stats["p50"] - before["p50"] > min_delta:
+            regressions.append((case, before["p50"], stats["p50"]))
+    return regressions, unchecked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--update-baseline", action="store_true", help="write results to benchmarks/baseline.json")
+    parser.add_argument("--record-missing", action="store_true",
+                        help="add cases missing from the baseline, keeping the recorded ones")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed p50 slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="ignore slowdowns smaller than this many ms")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats, for a fast local check")
+    parser.add_argument("--output", help="also write results as JSON to this path")
+    args = parser.parse_args()
+
+    mode = "quick" if args.quick else "full"
+    results = run_all(quick=args.quick)
+    recorded = {"mode": mode, "cases": results}
+
+    print(f"{'case':<70} {'p50 ms':>10} {'p95 ms':>10}")
+    for case, stats in results.items():
+        print(f"{case:<70} {stats['p50'] * 1000:>10.2f} {stats['p95'] * 1000:>10.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(recorded, f, indent=4)
+
+    if args.update_baseline:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(recorded, f, indent=4)
+        print(f"{mode.capitalize()} baseline written to {BASELINE_FILE}")
+        return 0
+
+    if not os.path.exists(BASELINE_FILE):
+        print("No baseline found, run with --update-baseline first.")
+        return 0
+
+    with open(BASELINE_FILE, "r") as f:
+        baseline = json.load(f)
+
+    if baseline.get("mode") != mode:
+        print(f"Baseline was recorded in {baseline.get('mode', 'an unknown')} mode, this run is {mode}; "
+              f"not comparing. Rerun in the same mode or record a {mode} baseline with --update-baseline.")
+        return 2
+
+    if args.record_missing:
+        missing = {case: stats for case, stats in results.items() if case not in baseline["cases"]}
+        baseline["cases"].update(missing)
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(baseline, f, indent=4)
+        print(f"Added {len(missing)} case(s) to {BASELINE_FILE}: {', '.join(missing) or 'none'}")
+
+    regressions, unchecked = compare(results, baseline["cases"], args.tolerance, args.min_delta_ms / 1000)
+    for case, before, after in regressions:
+        print(f"REGRESSION {case}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+    for case, reason in unchecked:
+        print(f"NOT COMPARED {case}: {reason}, record it with --record-missing or --update-baseline")
+    if regressions or unchecked:
+        return 1
+
+    print(f"No regressions beyond {args.tolerance:.0%} (and {args.min_delta_ms:g} ms) of the {mode} baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
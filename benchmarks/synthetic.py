@@ -0,0 +1,89 @@
+import random
+
+
+def round_robin(team_ids):
+    """
+    Double round robin schedule (circle method) as a list of rounds of (home, away) pairs.
+    """
+    teams = list(team_ids)
+    if len(teams) % 2:
+        teams.append(None)  # bye
+
+    rounds = []
+    for r in range(len(teams) - 1):
+        pairs = []
+        for i in range(len(teams) // 2):
+            home, away = teams[i], teams[-1 - i]
+            if home is not None and away is not None:
+                pairs.append((home, away) if r % 2 == 0 else (away, home))
+        rounds.append(pairs)
+        # keep the first team fixed and rotate the rest
+        teams = [teams[0]] + [teams[-1]] + teams[1:-1]
+
+    # second half of the season swaps home and away
+    return rounds + [[(away, home) for home, away in pairs] for pairs in rounds]
+
+
+def synthetic_league(num_teams, remaining_matchdays=10, seed=0):
+    """
+    Builds a league in football-data.org JSON format, plus matching odds, for benchmarking.
+
+    Args:
+        num_teams (int): Number of teams in the league.
+        remaining_matchdays (int): Matchdays left to play at the end of the season.
+        seed (int): Seed so every run benchmarks the same league.
+
+    Returns:
+        tuple: (standings_json, fixtures_json, odds_data)
+    """
+    rng = random.Random(seed)
+    teams = [{"id": 1000 + i, "name": f"Synthetic Team {i + 1:02d} FC"} for i in range(num_teams)]
+    names = {team["id"]: team["name"] for team in teams}
+
+    rounds = round_robin([team["id"] for team in teams])
+    played_matchdays = len(rounds) - remaining_matchdays
+
+    # current points roughly spread like a real table
+    table = []
+    for team in teams:
+        won = rng.randint(0, played_matchdays)
+        draw = rng.randint(0, played_matchdays - won)
+        lost = played_matchdays - won - draw
+        goals_for = rng.randint(won, 3 * played_matchdays)
+        goals_against = rng.randint(lost, 3 * played_matchdays)
+        table.append({
+            "team": team,
+            "playedGames": played_matchdays,
+            "won": won,
+            "draw": draw,
+            "lost": lost,
+            "points": 3 * won + draw,
+            "goalsFor": goals_for,
+            "goalsAgainst": goals_against,
+            "goalDifference": goals_for - goals_against
+        })
+    table.sort(key=lambda entry: (-entry["points"], -entry["goalDifference"]))
+    for position, entry in enumerate(table, start=1):
+        entry["position"] = position
+
+    matches = []
+    odds_data = {}
+    for matchday, pairs in enumerate(rounds[played_matchdays:], start=played_matchdays + 1):
+        for home, away in pairs:
+            matches.append({
+                "id": len(matches) + 1,
+                "utcDate": "2026-04-01T14:00:00Z",
+                "status": "SCHEDULED",
+                "matchday": matchday,
+                "homeTeam": {"id": home, "name": names[home]},
+                "awayTeam": {"id": away, "name": names[away]}
+            })
+            weights = [rng.uniform(0.2, 1.0), rng.uniform(0.2, 0.5), rng.uniform(0.2, 1.0)]
+            total = sum(weights)
+            odds_data[f"{names[home]} vs {names[away]}"] = {
+                "probabilities": {key: w / total for key, w in zip(["home", "draw", "away"], weights)}
+            }
+
+    standings_json = {"standings": [{"type": "TOTAL", "table": table}]}
+    fixtures_json = {"matches": matches}
+    return standings_json, fixtures_json, odds_data
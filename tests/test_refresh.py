@@ -0,0 +1,182 @@
+"""
+Runs backend.refresh against a local stand-in for football-data.org and OddsAPI,
+writing into a temporary data directory.
+
+    python -m pytest tests
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+import backend.data_loader as data_loader
+import backend.get_data as get_data
+import backend.get_odds as get_odds
+import backend.http_client as http_client
+from backend.data_loader import load_json, load_snapshot, snapshot_version, get_data_files, get_snapshot_file
+from backend.refresh import refresh
+
+BUNDLED_DATA_DIR = data_loader.get_data_dir()
+
+ODDS_PAYLOAD = [{
+    "home_team": "Arsenal FC",
+    "away_team": "Chelsea FC",
+    "bookmakers": [{"markets": [{"outcomes": [
+        {"name": "Arsenal FC", "price": 2.0},
+        {"name": "Chelsea FC", "price": 4.0},
+        {"name": "Draw", "price": 4.0}
+    ]}]}]
+}]
+
+
+class StandInServer:
+    """
+    Serves one JSON payload per path with an ETag, answering 304 to a matching
+    If-None-Match, and can fail a path with 503 a set number of times.
+    """
+
+    def __init__(self, payloads):
+        self.payloads = payloads  # path -> JSON payload
+        self.failures = {}  # path -> 503s still to send
+        self.requests = []  # (path, If-None-Match sent, status answered)
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if_none_match = self.headers.get("If-None-Match")
+                if server.failures.get(path):
+                    server.failures[path] -= 1
+                    self.reply(path, if_none_match, 503)
+                    return
+                body = json.dumps(server.payloads[path]).encode()
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if if_none_match == etag:
+                    self.reply(path, if_none_match, 304, etag=etag)
+                else:
+                    self.reply(path, if_none_match, 200, body, etag)
+
+            def reply(self, path, if_none_match, status, body=b"", etag=None):
+                server.requests.append((path, if_none_match, status))
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def statuses(self, path):
+        return [status for request_path, _, status in self.requests if request_path == path]
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    standings = load_json(os.path.join(BUNDLED_DATA_DIR, "prem_standings.json"))
+    fixtures = load_json(os.path.join(BUNDLED_DATA_DIR, "prem_fixtures.json"))
+    stand_in = StandInServer({
+        "/PL/standings": standings,
+        "/PL/matches": fixtures,
+        "/soccer_epl/odds": ODDS_PAYLOAD
+    })
+
+    # the URLs are read from FOOTBALL_DATA_URL / ODDS_API_URL at import, so point the modules at the stand-in
+    monkeypatch.setenv("FOOTBALL_DATA_URL", stand_in.url)
+    monkeypatch.setenv("ODDS_API_URL", stand_in.url)
+    monkeypatch.setattr(get_data, "API_URL", stand_in.url)
+    monkeypatch.setattr(get_odds, "ODDS_API_URL", stand_in.url)
+
+    # write everything to a temp data dir, with a fresh session and snapshot cache
+    monkeypatch.setattr(data_loader, "get_data_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(http_client, "get_data_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(data_loader, "_snapshot_cache", {})
+    monkeypatch.setattr(http_client, "_session", None)
+    monkeypatch.setattr(http_client, "RETRY_BACKOFF", 0)
+
+    yield stand_in
+    stand_in.httpd.shutdown()
+    stand_in.httpd.server_close()
+
+
+def read_files(paths):
+    contents = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            contents[path] = (f.read(), os.path.getmtime(path))
+    return contents
+
+
+def test_refresh_then_unchanged_sends_etag(server):
+    first = refresh("PL")
+    assert [first[source] for source in ("standings", "fixtures", "odds")] == ["updated"] * 3
+    assert first["snapshot"] is not None
+
+    second = refresh("PL")
+    assert [second[source] for source in ("standings", "fixtures", "odds")] == ["unchanged"] * 3
+    assert second["snapshot"] is None
+
+    for path in server.payloads:
+        assert server.statuses(path) == [200, 304]
+        (_, first_etag, _), (_, second_etag, _) = [request for request in server.requests if request[0] == path]
+        assert first_etag is None
+        assert second_etag is not None
+
+
+def test_invalid_payload_leaves_files_untouched(server):
+    refresh("PL")
+    standings_file, fixtures_file = get_data_files("PL", dummy=False)
+    paths = [standings_file, fixtures_file, get_snapshot_file("PL", dummy=False),
+             os.path.join(data_loader.get_data_dir(), http_client.VALIDATORS_FILE)]
+    before = read_files(paths)
+
+    # a table with a team missing fails validation
+    broken = copy.deepcopy(server.payloads["/PL/standings"])
+    broken["standings"][0]["table"].pop()
+    server.payloads["/PL/standings"] = broken
+
+    with pytest.raises(ValueError):
+        refresh("PL")
+    assert read_files(paths) == before
+
+
+def test_refresh_retries_503(server):
+    server.failures["/PL/standings"] = 2
+
+    report = refresh("PL")
+
+    assert report["standings"] == "updated"
+    assert server.statuses("/PL/standings") == [503, 503, 200]
+
+
+def test_load_snapshot_reads_binary_snapshot(server, monkeypatch):
+    report = refresh("PL")
+    standings_file, fixtures_file = get_data_files("PL", dummy=False)
+    json_version = snapshot_version(load_json(standings_file), load_json(fixtures_file))
+
+    binary_loads = []
+    load_binary_snapshot = data_loader.load_binary_snapshot
+
+    def counting_load(file_path):
+        binary_loads.append(file_path)
+        return load_binary_snapshot(file_path)
+
+    monkeypatch.setattr(data_loader, "load_binary_snapshot", counting_load)
+    standings_df, fixtures_df, version = load_snapshot(dummy=False, league="PL")
+
+    assert binary_loads == [get_snapshot_file("PL", dummy=False)]
+    assert version == report["snapshot"] == json_version
+    assert len(standings_df) == 20
+    assert len(fixtures_df) == len(server.payloads["/PL/matches"]["matches"])